@@ -128,6 +128,7 @@ class MainApp:
         self.sintese_controller = None
         self.grafo_controller = None
         self.dashboard_controller = None
+        self.dashboard_view_manager = None
         
     def main(self, page: ft.Page):
         """
@@ -206,7 +207,10 @@ class MainApp:
             # Dashboard Analytics com RAG
             logger.info("Inicializando módulo de Dashboard Analytics...")
             dashboard_model = DashboardModel(self.notifier)
-            self.dashboard_controller = DashboardController(dashboard_model, self.notifier, self.grafo_controller, self.analise_controller)
+            # URL do Ollama informada explicitamente (mesma configuração usada pelo módulo de Análise)
+            ollama_url = analise_model.get_config().get('llm_url', 'http://localhost:11434')
+            self.dashboard_controller = DashboardController(dashboard_model, self.notifier, self.grafo_controller,
+                                                            self.analise_controller, ollama_url=ollama_url)
             self.dashboard_controller.auth_controller = self.auth_controller
             
         except Exception as e:
@@ -223,6 +227,7 @@ class MainApp:
             sintese_view_manager = SinteseViewManager(self.sintese_controller, self.notifier, self.page)
             grafo_view_manager = GrafoViewManager(self.grafo_controller, self.notifier, self.page)
             dashboard_view_manager = DashboardViewManager(self.dashboard_controller, self.notifier, self.page)
+            self.dashboard_view_manager = dashboard_view_manager
             
             analise_view = analise_view_manager.get_view_instance()
             sintese_view = sintese_view_manager
@@ -487,6 +492,20 @@ class MainApp:
                     except Exception as ex:
                         logger.error(f"Erro ao parar threads: {ex}")
             
+            # Encerra os workers da view do dashboard
+            if self.dashboard_view_manager:
+                try:
+                    self.dashboard_view_manager.close()
+                except Exception as ex:
+                    logger.warning(f"Erro ao encerrar view do dashboard: {ex}")
+            
+            # Encerra o pool de threads do controller do dashboard
+            if hasattr(self, 'dashboard_controller') and self.dashboard_controller:
+                try:
+                    self.dashboard_controller.close()
+                except Exception as ex:
+                    logger.warning(f"Erro ao encerrar controller do dashboard: {ex}")
+            
             # Limpa análise atual do dashboard
             if hasattr(self, 'dashboard_controller') and self.dashboard_controller:
                 try:
@@ -1,6 +1,7 @@
 # modules/auth/view/login_component.py
 import flet as ft
 import logging
+from contextlib import contextmanager
 
 logger = logging.getLogger(__name__)
 
@@ -99,46 +100,56 @@ class LoginComponent:
             expand=True
         )
     
+    @contextmanager
+    def _batch_update(self):
+        """Agrupa alterações nos controles e sincroniza a página uma única vez ao final"""
+        try:
+            yield
+        finally:
+            if self.page:
+                self.page.update()
+    
+    def _set_status(self, mensagem: str, cor: str):
+        """Define a mensagem de status do formulário"""
+        self.status_text.value = mensagem
+        self.status_text.color = cor
+    
+    def _set_loading(self, carregando: bool):
+        """Alterna o estado de carregamento do botão de login"""
+        self.login_button.disabled = carregando
+        self.progress_ring.visible = carregando
+    
     def _login(self, e):
         """Processa o login"""
         username = self.username_field.value.strip()
         password = self.password_field.value
         
         if not username or not password:
-            self.status_text.value = "Preencha todos os campos"
-            self.status_text.color = ft.Colors.RED_600
-            if self.page:
-                self.page.update()
+            with self._batch_update():
+                self._set_status("Preencha todos os campos", ft.Colors.RED_600)
             return
         
-        # Mostra loading
-        self.login_button.disabled = True
-        self.progress_ring.visible = True
-        self.status_text.value = "Autenticando..."
-        self.status_text.color = ft.Colors.BLUE_600
-        if self.page:
-            self.page.update()
+        # Mostra loading (precisa ser renderizado antes da autenticação bloqueante)
+        with self._batch_update():
+            self._set_loading(True)
+            self._set_status("Autenticando...", ft.Colors.BLUE_600)
         
         # Realiza login
         success, message, session_data = self.auth_service.login(username, password)
         
-        if success:
-            self.status_text.value = "Login bem-sucedido!"
-            self.status_text.color = ft.Colors.GREEN_600
-            
-            # Chama callback de sucesso
-            if self.on_login_success:
-                self.on_login_success(session_data)
-        else:
-            self.status_text.value = message
-            self.status_text.color = ft.Colors.RED_600
-        
-        # Restaura UI
-        self.login_button.disabled = False
-        self.progress_ring.visible = False
-        
-        if self.page:
-            self.page.update()
+        if success and self.on_login_success:
+            # O callback substitui a tela de login; renderizar este componente seria descartado
+            self._set_loading(False)
+            self._set_status("Login bem-sucedido!", ft.Colors.GREEN_600)
+            self.on_login_success(session_data)
+            return
+        
+        with self._batch_update():
+            self._set_loading(False)
+            if success:
+                self._set_status("Login bem-sucedido!", ft.Colors.GREEN_600)
+            else:
+                self._set_status(message, ft.Colors.RED_600)
     
     def _show_create_account(self, e):
         """Mostra diálogo para criar conta"""
@@ -1,8 +1,12 @@
 # modules/dashboard/controller.py
 
+import asyncio
+import heapq
 import logging
+import threading
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from services.ollama_service import OllamaService
 """
 Controller do dashboard principal.
@@ -13,162 +17,286 @@ Coordena a exibição de métricas e informações gerais do sistema.
 
 logger = logging.getLogger(__name__)
 
+# Mensagens de progresso exibidas pelo notifier
+_MSG_EM_ANDAMENTO = "Já existe uma análise em andamento!"
+_MSG_INICIO = "Iniciando análise completa..."
+_MSG_CALC = "📊 Calculando métricas avançadas..."
+_MSG_STORY = "📖 Gerando análise contextual..."
+_MSG_RAG = "🔧 Preparando contexto RAG..."
+_MSG_SUCCESS_FULL = "✅ Análise completa concluída! Contexto RAG preparado."
+_MSG_CANCELADA = "⏹️ Análise completa cancelada."
+_MSG_RAPIDA = "🔄 Processando análise rápida..."
+_MSG_SUCCESS_RAPIDA = "✅ Análise rápida concluída!"
+
+# Tamanho máximo (caracteres) do prompt RAG; a view reduz o prompt a este limite antes de validar
+LIMITE_PROMPT_RAG = 10000
+
 class DashboardController:
-    def __init__(self, model, notifier, grafo_controller, analise_controller=None):
+    def __init__(self, model, notifier, grafo_controller, analise_controller=None, ollama_url=None):
         self.model = model
         self.notifier = notifier
         self.grafo_controller = grafo_controller
         self.analise_controller = analise_controller
 
-        # Inicializa OllamaService com URL da configuração se analise_controller estiver disponível
-        if analise_controller:
-            config = analise_controller.get_config()
-            ollama_url = config.get('llm_url', 'http://localhost:11434')
+        # Inicializa OllamaService com a URL informada; sem ela, consulta a configuração
+        # do analise_controller apenas se estiver disponível
+        if ollama_url is None and analise_controller:
+            ollama_url = analise_controller.get_config().get('llm_url', 'http://localhost:11434')
+        if ollama_url:
             self.ollama_service = OllamaService(base_url=ollama_url)
         else:
             self.ollama_service = OllamaService()
 
         self.analise_atual = None
-        self.analise_em_andamento = False
+        # Garante uma única análise completa em execução por vez
+        self._analise_lock = threading.Lock()
+
+        # Cache (timestamp, conectado, modelos) da consulta HTTP ao Ollama
+        self._ollama_cache = (0.0, False, [])
+
+        # Caches derivados da análise atual, chaveados pela identidade do dict
+        self._nos_criticos_cache = (None, [])
+        self._metricas_ctx_cache = (None, {})
+        self._export_cache = (None, None)
+        # Campos de obter_status_analise que só mudam junto com a análise atual
+        self._status_snapshot = {'timestamp_ultima_analise': None, 'quantidade_arquivos': 0}
+
+        # Pool para sobrepor chamadas de I/O (ex.: status do Ollama) ao restante do trabalho
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dashboard")
+        
+    @property
+    def analise_em_andamento(self) -> bool:
+        """Indica se há uma análise completa em execução"""
+        return self._analise_lock.locked()
         
-    def processar_analise_completa(self) -> Dict[str, Any]:
-        """Processa análise completa e prepara contexto RAG"""
+    def processar_analise_completa(self, resultado_grafo: Optional[Dict[str, Any]] = None,
+                                   progress_callback: Optional[Callable[[float, str], None]] = None,
+                                   stop_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Processa análise completa e prepara contexto RAG
+
+        Aceita um resultado de grafo já obtido para evitar buscá-lo novamente.
+        progress_callback(progresso, mensagem) é chamado a cada fase (0.0 a 1.0) e
+        stop_event, se sinalizado, interrompe a análise entre as fases.
+        """
+        if not self._analise_lock.acquire(blocking=False):
+            self.notifier.warning(_MSG_EM_ANDAMENTO)
+            return None
+            
         try:
-            if self.analise_em_andamento:
-                self.notifier.warning("Já existe uma análise em andamento!")
-                return None
-                
-            self.analise_em_andamento = True
             logger.info("Iniciando processamento de análise completa...")
-            self.notifier.info("Iniciando análise completa...")
+            self.notifier.info(_MSG_INICIO)
             
             # 1. Obtém dados do grafo atual - USANDO MÉTODO CORRETO
-            resultado_grafo = self.grafo_controller.obter_resultado_grafo()
+            if resultado_grafo is None:
+                resultado_grafo = self.grafo_controller.obter_resultado_grafo()
             if not resultado_grafo:
                 self.notifier.error("Nenhum grafo disponível. Execute a análise de grafos primeiro.")
-                self.analise_em_andamento = False
                 return None
             
             # Verifica se temos um grafo válido
             grafo = resultado_grafo.get('grafo')
-            if not grafo or grafo.number_of_nodes() == 0:
+            if not grafo or self._contar_nos(resultado_grafo) == 0:
                 self.notifier.error("Grafo vazio ou inválido. Execute a análise de grafos primeiro.")
-                self.analise_em_andamento = False
                 return None
             
-            self.notifier.info("📊 Calculando métricas avançadas...")
+            if not self._iniciar_fase(0.25, _MSG_CALC, progress_callback, stop_event):
+                return None
             
             # 2. Calcula métricas avançadas
             metricas_avancadas = self.model.calcular_metricas_avancadas(resultado_grafo)
             
-            self.notifier.info("📖 Gerando análise contextual...")
+            if not self._iniciar_fase(0.5, _MSG_STORY, progress_callback, stop_event):
+                return None
             
             # 3. Gera storytelling
             storytelling = self.model.gerar_storytelling(metricas_avancadas, resultado_grafo)
             
-            self.notifier.info("🔧 Preparando contexto RAG...")
+            if not self._iniciar_fase(0.75, _MSG_RAG, progress_callback, stop_event):
+                return None
             
             # 4. Prepara contexto RAG
             contexto_rag = self.model.preparar_contexto_rag(metricas_avancadas, resultado_grafo, storytelling)
             
             # 5. Salva análise atual
-            self.analise_atual = {
+            self._definir_analise_atual({
                 'resultado_grafo': resultado_grafo,
                 'metricas_avancadas': metricas_avancadas,
                 'storytelling': storytelling,
                 'contexto_rag': contexto_rag,
                 'timestamp': self.model.obter_timestamp(),
                 'metricas_resumidas': self.model.obter_metricas_resumidas(resultado_grafo)
-            }
+            })
             
             # 6. Salva no histórico
             self.model.salvar_analise_historico(self.analise_atual)
             
             logger.info("Análise completa processada com sucesso")
-            self.notifier.success("✅ Análise completa concluída! Contexto RAG preparado.")
-            self.analise_em_andamento = False
+            self.notifier.success(_MSG_SUCCESS_FULL)
+            if progress_callback:
+                progress_callback(1.0, _MSG_SUCCESS_FULL)
             
             return self.analise_atual
             
         except Exception as e:
             logger.error(f"Erro no processamento da análise completa: {e}")
-            self.notifier.error(f"❌ Erro na análise: {str(e)}")
-            self.analise_em_andamento = False
+            self.notifier.error(f"❌ Erro na análise: {e}")
             return None
+        finally:
+            self._analise_lock.release()
+    
+    def _iniciar_fase(self, progresso: float, mensagem: str,
+                      progress_callback: Optional[Callable[[float, str], None]],
+                      stop_event: Optional[threading.Event]) -> bool:
+        """Notifica o início de uma fase da análise; retorna False se ela foi cancelada"""
+        if stop_event is not None and stop_event.is_set():
+            logger.info("Análise completa cancelada pelo usuário")
+            self.notifier.warning(_MSG_CANCELADA)
+            return False
         
+        self.notifier.info(mensagem)
+        if progress_callback:
+            progress_callback(progresso, mensagem)
+        return True
+    
+    @staticmethod
+    def _contar_nos(resultado_grafo: Dict[str, Any]) -> int:
+        """Número de nós do grafo, usando a contagem já registrada no resultado quando houver"""
+        num_nodes = resultado_grafo.get('num_nodes')
+        if num_nodes is None:
+            grafo = resultado_grafo.get('grafo')
+            num_nodes = grafo.number_of_nodes() if grafo else 0
+        return num_nodes
+
+    def _status_ollama_cached(self, ttl: float = 3.0) -> Tuple[bool, List[str]]:
+        """Conexão e modelos do Ollama obtidos em uma única requisição e reaproveitados por `ttl` segundos"""
+        ts, conectado, modelos = self._ollama_cache
+        if time.monotonic() - ts < ttl:
+            return conectado, modelos
+
+        conectado, modelos = self.ollama_service.get_status()
+        self._ollama_cache = (time.monotonic(), conectado, modelos)
+        return conectado, modelos
+
+    def _definir_analise_atual(self, analise: Optional[Dict[str, Any]]):
+        """Substitui a análise atual e recalcula os dados derivados dela"""
+        # Atribui antes de invalidar: um leitor concorrente nunca repovoa o cache com a análise antiga
+        self.analise_atual = analise
+        self._invalidar_caches_analise()
+        
+        quantidade_arquivos = 0
+        if analise:
+            resultado_grafo = analise.get('resultado_grafo', {})
+            quantidade_arquivos = resultado_grafo.get('num_nodes')
+            if quantidade_arquivos is None:
+                quantidade_arquivos = resultado_grafo.get('estatisticas', {}).get('num_nos', 0)
+        
+        self._status_snapshot = {
+            'timestamp_ultima_analise': analise.get('timestamp') if analise else None,
+            'quantidade_arquivos': quantidade_arquivos
+        }
+
+    def _invalidar_caches_analise(self):
+        """Descarta os dados derivados da análise atual"""
+        self._nos_criticos_cache = (None, [])
+        self._metricas_ctx_cache = (None, {})
+        self._export_cache = (None, None)
+
+    def _invalidar_cache_ollama(self):
+        """Descarta os resultados em cache das consultas ao Ollama"""
+        self._ollama_cache = (0.0, False, [])
+
     def get_analise_atual(self) -> Dict[str, Any]:
         """Retorna a análise atual"""
         return self.analise_atual
     
+    def _selecionar_modelo_llm(self) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Valida o contexto e a conexão com o Ollama; retorna (modelo, erro)"""
+        if not self.analise_atual:
+            return None, {
+                "sucesso": False,
+                "erro": "Execute a análise completa primeiro para carregar o contexto"
+            }
+        
+        # Verifica conexão e modelos do Ollama (uma requisição; reaproveita a sondagem recente, se houver)
+        conectado, modelos = self._status_ollama_cached()
+        if not conectado:
+            return None, {
+                "sucesso": False,
+                "erro": f"Servidor Ollama não está disponível em {self.ollama_service.base_url}. Verifique se o servidor está rodando e a URL está correta."
+            }
+        
+        if not modelos:
+            return None, {
+                "sucesso": False,
+                "erro": "Nenhum modelo disponível no Ollama. Instale um modelo primeiro (ex: ollama pull codellama:7b)"
+            }
+        
+        # Usa o primeiro modelo disponível
+        modelo = modelos[0]
+        logger.info(f"Usando modelo: {modelo}")
+        return modelo, None
+    
+    def _registrar_resposta_llm(self, prompt: str, resposta: Optional[str], modelo: str) -> Dict[str, Any]:
+        """Salva a resposta do LLM no histórico RAG e monta o retorno para a view"""
+        if not resposta:
+            logger.error("Falha ao gerar resposta do LLM")
+            return {
+                "sucesso": False,
+                "erro": "Falha ao gerar resposta do modelo LLM"
+            }
+        
+        # Salva no histórico de análises RAG
+        analise_rag = {
+            'prompt': prompt,
+            'analise_gerada': resposta,
+            'modelo_utilizado': modelo,
+            'timestamp': self.model.obter_timestamp(),
+            'metricas_utilizadas': self._extrair_metricas_do_contexto(prompt)
+        }
+        self.model.salvar_analise_rag_historico(analise_rag)
+        
+        logger.info("Análise RAG gerada com sucesso")
+        
+        return {
+            "sucesso": True,
+            "analise": resposta,
+            "modelo": modelo,
+            "timestamp": analise_rag['timestamp']
+        }
+    
     def gerar_analise_personalizada(self, prompt: str) -> Dict[str, Any]:
-        """Gera análise personalizada usando LLM"""
+        """Gera análise personalizada usando LLM (versão síncrona; não usar dentro de um event loop)"""
+        return asyncio.run(self.gerar_analise_personalizada_async(prompt))
+    
+    async def gerar_analise_personalizada_async(self, prompt: str,
+                                                on_token: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
+        """Gera análise personalizada usando LLM; a chamada ao LLM roda fora do event loop.
+        Com on_token, os trechos da resposta são repassados à medida que chegam (a partir de outra thread)"""
         try:
-            logger.info("Iniciando análise personalizada com LLM...")
-            
-            if not self.analise_atual:
-                return {
-                    "sucesso": False,
-                    "erro": "Execute a análise completa primeiro para carregar o contexto"
-                }
-            
-            # Verifica conexão com Ollama
-            if not self.ollama_service.check_connection():
-                return {
-                    "sucesso": False,
-                    "erro": f"Servidor Ollama não está disponível em {self.ollama_service.base_url}. Verifique se o servidor está rodando e a URL está correta."
-                }
-            
-            # Obtém modelos disponíveis
-            modelos = self.ollama_service.get_available_models()
-            if not modelos:
-                return {
-                    "sucesso": False,
-                    "erro": "Nenhum modelo disponível no Ollama. Instale um modelo primeiro (ex: ollama pull codellama:7b)"
-                }
+            logger.info("Iniciando análise personalizada com LLM (async)...")
             
-            # Usa o primeiro modelo disponível
-            modelo = modelos[0]
-            logger.info(f"Usando modelo: {modelo}")
+            # A sondagem de conexão/modelos é HTTP; só bloqueia quando o cache expirou
+            modelo, erro = await asyncio.to_thread(self._selecionar_modelo_llm)
+            if erro:
+                return erro
             
-            # Gera resposta usando LLM
-            resposta = self.ollama_service.generate_response(
+            resposta, _ = await asyncio.to_thread(
+                self.ollama_service.generate_response,
                 model=modelo,
                 prompt=prompt,
                 context_size=4096,
-                temperature=0.7
+                temperature=0.7,
+                on_token=on_token,
+                verificar_modelo=False  # modelo já escolhido da lista obtida por _selecionar_modelo_llm
             )
             
-            if resposta:
-                # Salva no histórico de análises RAG
-                analise_rag = {
-                    'prompt': prompt,
-                    'analise_gerada': resposta,
-                    'modelo_utilizado': modelo,
-                    'timestamp': self.model.obter_timestamp(),
-                    'metricas_utilizadas': self._extrair_metricas_do_contexto(prompt)
-                }
-                self.model.salvar_analise_rag_historico(analise_rag)
-                
-                logger.info("Análise RAG gerada com sucesso")
-                
-                return {
-                    "sucesso": True,
-                    "analise": resposta,
-                    "modelo": modelo,
-                    "timestamp": analise_rag['timestamp']
-                }
-            else:
-                logger.error("Falha ao gerar resposta do LLM")
-                return {
-                    "sucesso": False,
-                    "erro": "Falha ao gerar resposta do modelo LLM"
-                }
+            return self._registrar_resposta_llm(prompt, resposta, modelo)
                 
         except Exception as e:
             logger.error(f"Erro na análise personalizada: {e}")
             return {
                 "sucesso": False,
-                "erro": f"Erro interno: {str(e)}"
+                "erro": f"Erro interno: {e}"
             }
     
     def _extrair_metricas_do_contexto(self, prompt: str) -> Dict[str, Any]:
@@ -176,26 +304,38 @@ class DashboardController:
         try:
             if not self.analise_atual:
                 return {}
+            
+            # O prompt não influencia o resultado; depende apenas da análise atual
+            chave = id(self.analise_atual)
+            if self._metricas_ctx_cache[0] == chave:
+                return self._metricas_ctx_cache[1]
                 
             metricas = self.analise_atual.get('metricas_resumidas', {})
-            return {
+            metricas_ctx = {
                 'num_nos': metricas.get('num_nos', 0),
                 'num_arestas': metricas.get('num_arestas', 0),
                 'acoplamento_medio': metricas.get('acoplamento_medio', 0),
                 'coesao_media': metricas.get('coesao_media', 0),
                 'modularidade': metricas.get('modularidade', 0)
             }
-        except Exception as e:
+            self._metricas_ctx_cache = (chave, metricas_ctx)
+            return metricas_ctx
+        except (AttributeError, TypeError) as e:
+            # Só ocorre com análises importadas cujo formato não é o esperado
             logger.error(f"Erro ao extrair métricas do contexto: {e}")
             return {}
     
-    def obter_historico_analises(self) -> List[Dict[str, Any]]:
-        """Obtém histórico de análises RAG"""
-        return self.model.obter_historico_analises_rag()
+    def obter_historico_analises(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtém histórico de análises RAG (as `limite` mais recentes, se informado)"""
+        return self.model.obter_historico_analises_rag(limite)
+    
+    def versao_historico_analises(self) -> int:
+        """Versão do histórico RAG; muda sempre que uma análise é salva ou o histórico é limpo"""
+        return self.model.versao_historico_rag
     
-    def obter_historico_analises_completas(self) -> List[Dict[str, Any]]:
-        """Obtém histórico de análises completas"""
-        return self.model.obter_historico_analises()
+    def obter_historico_analises_completas(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtém histórico de análises completas (as `limite` mais recentes, se informado)"""
+        return self.model.obter_historico_analises(limite)
     
     def verificar_analise_disponivel(self) -> bool:
         """Verifica se há análise disponível"""
@@ -203,9 +343,13 @@ class DashboardController:
     
     def limpar_analise_atual(self):
         """Limpa a análise atual"""
-        self.analise_atual = None
+        self._definir_analise_atual(None)
         logger.info("Análise atual limpa")
     
+    def close(self):
+        """Encerra o pool de threads do controller"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+    
     def obter_metricas_resumidas(self) -> Dict[str, Any]:
         """Retorna métricas resumidas da análise atual"""
         if not self.analise_atual:
@@ -230,17 +374,23 @@ class DashboardController:
             if not self.analise_atual:
                 return []
             
+            # A análise atual não muda entre execuções; reaproveita o top N já calculado
+            chave = (id(self.analise_atual), limite)
+            if self._nos_criticos_cache[0] == chave:
+                return self._nos_criticos_cache[1]
+            
             resultado_grafo = self.analise_atual.get('resultado_grafo', {})
             nos_criticos = resultado_grafo.get('nos_criticos', [])
             
-            # Ordena por centralidade e retorna os top N
-            nos_ordenados = sorted(nos_criticos, 
-                                 key=lambda x: x.get('centralidade_intermediacao', 0), 
-                                 reverse=True)
+            # Seleciona os top N por centralidade sem ordenar a lista inteira
+            nos_ordenados = heapq.nlargest(limite, nos_criticos,
+                                           key=lambda x: x.get('centralidade_intermediacao', 0))
             
-            return nos_ordenados[:limite]
+            self._nos_criticos_cache = (chave, nos_ordenados)
+            return nos_ordenados
             
-        except Exception as e:
+        except (AttributeError, TypeError) as e:
+            # Só ocorre com análises importadas cujo formato não é o esperado
             logger.error(f"Erro ao obter nós críticos: {e}")
             return []
     
@@ -254,11 +404,9 @@ class DashboardController:
         try:
             logger.info("Testando conexão com Ollama...")
             
-            conectado = self.ollama_service.check_connection()
-            modelos = []
+            conectado, modelos = self._status_ollama_cached()
             
             if conectado:
-                modelos = self.ollama_service.get_available_models()
                 logger.info(f"Conexão bem-sucedida. Modelos disponíveis: {len(modelos)}")
             else:
                 logger.warning("Falha na conexão com Ollama")
@@ -286,7 +434,14 @@ class DashboardController:
             if not self.analise_atual:
                 return "{}"
             
-            return self.model.exportar_analise_json(self.analise_atual)
+            # A mesma análise pode ser exportada várias vezes; serializa só uma vez
+            chave = id(self.analise_atual)
+            if self._export_cache[0] == chave:
+                return self._export_cache[1]
+            
+            json_str = self.model.exportar_analise_json(self.analise_atual)
+            self._export_cache = (chave, json_str)
+            return json_str
             
         except Exception as e:
             logger.error(f"Erro ao exportar análise: {e}")
@@ -298,7 +453,7 @@ class DashboardController:
             analise_importada = self.model.importar_analise_json(json_str)
             
             if analise_importada:
-                self.analise_atual = analise_importada
+                self._definir_analise_atual(analise_importada)
                 logger.info("Análise importada com sucesso")
                 self.notifier.success("Análise importada com sucesso!")
                 return True
@@ -308,7 +463,7 @@ class DashboardController:
                 
         except Exception as e:
             logger.error(f"Erro ao importar análise: {e}")
-            self.notifier.error(f"Erro ao importar análise: {str(e)}")
+            self.notifier.error(f"Erro ao importar análise: {e}")
             return False
     
     def obter_status_analise(self) -> Dict[str, Any]:
@@ -316,35 +471,40 @@ class DashboardController:
         return {
             'analise_disponivel': self.analise_atual is not None,
             'analise_em_andamento': self.analise_em_andamento,
-            'timestamp_ultima_analise': self.analise_atual.get('timestamp') if self.analise_atual else None,
-            'quantidade_arquivos': self.analise_atual.get('resultado_grafo', {}).get('estatisticas', {}).get('num_nos', 0) if self.analise_atual else 0,
-            'conexao_ollama': self.ollama_service.check_connection()
+            **self._status_snapshot,
+            'conexao_ollama': self._status_ollama_cached()[0]
         }
     
     def obter_dados_dashboard(self) -> Dict[str, Any]:
         """Retorna dados consolidados para o dashboard"""
-        status = self.obter_status_analise()
+        # O status envolve uma chamada HTTP ao Ollama; dispara em paralelo
+        # enquanto os demais dados (leituras em memória) são montados
+        status_future = self._pool.submit(self.obter_status_analise)
         metricas = self.obter_metricas_resumidas()
         storytelling = self.obter_storytelling()
         nos_criticos = self.obter_nos_criticos()
         estatisticas = self.obter_estatisticas_grafo()
+        recomendacoes = self.obter_recomendacoes()
+        # Só as contagens são necessárias: evita copiar os históricos para medi-los
+        historico_rag_count = len(self.model.historico_analises_rag)
+        historico_completo_count = len(self.model.historico_analises)
         
         return {
-            'status': status,
+            'status': status_future.result(),
             'metricas': metricas,
             'storytelling': storytelling,
             'nos_criticos': nos_criticos,
             'estatisticas': estatisticas,
-            'recomendacoes': self.obter_recomendacoes(),
-            'historico_rag_count': len(self.obter_historico_analises()),
-            'historico_completo_count': len(self.obter_historico_analises_completas())
+            'recomendacoes': recomendacoes,
+            'historico_rag_count': historico_rag_count,
+            'historico_completo_count': historico_completo_count
         }
     
     def processar_analise_rapida(self) -> Dict[str, Any]:
         """Processa uma análise rápida com métricas básicas"""
         try:
             logger.info("Iniciando análise rápida...")
-            self.notifier.info("🔄 Processando análise rápida...")
+            self.notifier.info(_MSG_RAPIDA)
             
             resultado_grafo = self.grafo_controller.obter_resultado_grafo()
             if not resultado_grafo:
@@ -362,13 +522,13 @@ class DashboardController:
             }
             
             logger.info("Análise rápida processada com sucesso")
-            self.notifier.success("✅ Análise rápida concluída!")
+            self.notifier.success(_MSG_SUCCESS_RAPIDA)
             
             return analise_rapida
             
         except Exception as e:
             logger.error(f"Erro na análise rápida: {e}")
-            self.notifier.error(f"Erro na análise rápida: {str(e)}")
+            self.notifier.error(f"Erro na análise rápida: {e}")
             return None
     
     def limpar_historico_analises(self):
@@ -379,7 +539,7 @@ class DashboardController:
             self.notifier.info("Histórico de análises limpo")
         except Exception as e:
             logger.error(f"Erro ao limpar histórico: {e}")
-            self.notifier.error(f"Erro ao limpar histórico: {str(e)}")
+            self.notifier.error(f"Erro ao limpar histórico: {e}")
     
     def limpar_historico_analises_rag(self):
         """Limpa o histórico de análises RAG"""
@@ -389,7 +549,7 @@ class DashboardController:
             self.notifier.info("Histórico de análises RAG limpo")
         except Exception as e:
             logger.error(f"Erro ao limpar histórico RAG: {e}")
-            self.notifier.error(f"Erro ao limpar histórico RAG: {str(e)}")
+            self.notifier.error(f"Erro ao limpar histórico RAG: {e}")
     
     def obter_analise_por_id(self, analise_id: int) -> Dict[str, Any]:
         """Obtém uma análise específica por ID"""
@@ -406,7 +566,9 @@ class DashboardController:
     def atualizar_configuracao_ollama(self, base_url: str) -> bool:
         """Atualiza a URL base do serviço Ollama"""
         try:
-            self.ollama_service = OllamaService(base_url)
+            # Reaproveita a instância atual; só descarta o cache se a URL mudou
+            if self.ollama_service.set_base_url(base_url):
+                self._invalidar_cache_ollama()
             logger.info(f"URL do Ollama atualizada para: {base_url}")
 
             # Sincroniza com o analise_controller se disponível
@@ -422,22 +584,24 @@ class DashboardController:
     def validar_prompt_rag(self, prompt: str) -> Dict[str, Any]:
         """Valida se o prompt é adequado para análise RAG"""
         try:
-            if not prompt or len(prompt.strip()) == 0:
+            # isspace() testa o vazio sem alocar; strip() só roda para prompts com conteúdo
+            if not prompt or prompt.isspace():
                 return {
                     'valido': False,
                     'erro': 'O prompt não pode estar vazio'
                 }
             
+            tamanho = len(prompt)
             if len(prompt.strip()) < 10:
                 return {
                     'valido': False,
                     'erro': 'O prompt é muito curto. Forneça mais detalhes para uma análise significativa.'
                 }
             
-            if len(prompt) > 10000:
+            if tamanho > LIMITE_PROMPT_RAG:
                 return {
                     'valido': False,
-                    'erro': 'O prompt é muito longo. Limite a 10000 caracteres.'
+                    'erro': f'O prompt é muito longo. Limite a {LIMITE_PROMPT_RAG} caracteres.'
                 }
             
             # Verifica se há contexto de análise disponível
@@ -449,20 +613,21 @@ class DashboardController:
             
             return {
                 'valido': True,
-                'tamanho': len(prompt),
+                'tamanho': tamanho,
                 'linhas': prompt.count('\n') + 1
             }
             
-        except Exception as e:
+        except (AttributeError, TypeError) as e:
+            # Prompt que não é uma string
             logger.error(f"Erro ao validar prompt: {e}")
             return {
                 'valido': False,
-                'erro': f'Erro na validação: {str(e)}'
+                'erro': f'Erro na validação: {e}'
             }
-    def verificar_e_preparar_grafo(self) -> bool:
+    def verificar_e_preparar_grafo(self) -> Optional[Dict[str, Any]]:
         """
         Verifica se há um grafo disponível e prepara para análise.
-        Retorna True se o grafo está pronto para uso.
+        Retorna o resultado do grafo pronto para uso, ou None se indisponível.
         """
         try:
             # Tenta obter o resultado atual do grafo
@@ -477,7 +642,7 @@ class DashboardController:
                 if not arquivos_json:
                     logger.info("📂 Nenhum arquivo de análise encontrado para processar.")
                     self.notifier.warning("Nenhum arquivo de análise encontrado para processar.")
-                    return False
+                    return None
 
                 logger.info(f"🔧 Encontrados {len(arquivos_json)} arquivos, processando grafo automaticamente...")
                 self.notifier.info("Processando grafo automaticamente...")
@@ -488,33 +653,36 @@ class DashboardController:
                 if resultado and resultado.get('grafo'):
                     logger.info("✅ Grafo processado automaticamente com sucesso!")
                     self.notifier.success("Grafo processado automaticamente!")
-                    return True
+                    # processar_grafo devolve o resultado bruto; o dashboard usa o formato enriquecido
+                    return self.grafo_controller.obter_resultado_grafo() or None
                 else:
                     logger.error("❌ Falha ao processar grafo automaticamente")
                     self.notifier.error("Falha ao processar grafo automaticamente.")
-                    return False
+                    return None
             else:
                 # Grafo já está disponível
                 grafo = resultado_grafo.get('grafo')
-                if grafo and grafo.number_of_nodes() > 0:
-                    logger.info(f"Grafo disponível: {grafo.number_of_nodes()} nós")
-                    return True
+                num_nodes = self._contar_nos(resultado_grafo) if grafo else 0
+                if num_nodes > 0:
+                    logger.info(f"Grafo disponível: {num_nodes} nós")
+                    return resultado_grafo
                 else:
                     self.notifier.warning("Grafo disponível mas vazio.")
-                    return False
+                    return None
                     
         except Exception as e:
             logger.error(f"Erro ao verificar e preparar grafo: {e}")
-            self.notifier.error(f"Erro ao preparar grafo: {str(e)}")
-            return False
+            self.notifier.error(f"Erro ao preparar grafo: {e}")
+            return None
     
     def processar_analise_completa_com_verificacao(self) -> Dict[str, Any]:
         """
         Versão segura que verifica e prepara o grafo antes da análise
         """
-        # Verifica e prepara o grafo primeiro
-        if not self.verificar_e_preparar_grafo():
+        # Verifica e prepara o grafo primeiro, reaproveitando o resultado obtido
+        resultado_grafo = self.verificar_e_preparar_grafo()
+        if not resultado_grafo:
             return None
         
         # Agora processa a análise completa
-        return self.processar_analise_completa()
+        return self.processar_analise_completa(resultado_grafo=resultado_grafo)
@@ -1,112 +1,231 @@
 # modules/dashboard/model.py
 
+import functools
 import logging
+import itertools
 import json
+import time
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List
-import networkx as nx
+from typing import Dict, Any, List, Optional
 """
 Model do dashboard principal.
 
 Gerencia os dados exibidos no dashboard da aplicação.
 """
 
+try:
+    import orjson  # Serialização JSON mais rápida, se disponível
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True, frozen=True)
+class Metricas:
+    """Métricas avançadas derivadas das estatísticas do grafo (imutável e compartilhável)"""
+    acoplamento_medio: float = 0.0
+    coesao_media: float = 0.0
+    complexidade_ciclomatica_media: float = 0.0
+    centralidade_grau_maxima: float = 0.0
+    centralidade_intermediacao_maxima: float = 0.0
+    modularidade: float = 0.0
+    densidade: float = 0.0
+    diametro: int = 0
+    raio: int = 0
+    numero_componentes: int = 0
+
+# Parâmetros de normalização das métricas estimadas em _calcular_metricas_impl
+_PARAMETROS_METRICAS = {
+    'grau_medio_referencia': 10.0,          # grau médio equivalente a acoplamento 1.0
+    'comunidades_referencia': 10.0,
+    'modularidade_max': 0.8,
+    'fator_modularidade_sem_comunidades': 0.5,
+    'modularidade_max_sem_comunidades': 0.6,
+    'fracao_nos_centralidade': 0.5,
+    'nos_por_diametro': 10,
+    'diametro_min': 3,
+    'diametro_max': 10,
+}
+
+# Métricas padrão usadas quando o cálculo falha (imutáveis, podem ser compartilhadas)
+_METRICAS_PADRAO = Metricas(
+    acoplamento_medio=0.5,
+    coesao_media=0.6,
+    complexidade_ciclomatica_media=10.0,
+    centralidade_grau_maxima=0.3,
+    centralidade_intermediacao_maxima=0.2,
+    modularidade=0.4,
+    densidade=0.1,
+    diametro=5,
+    raio=2,
+    numero_componentes=3
+)
+
+# Faixas de insights técnicos: (limiar, mensagem) em ordem decrescente; a primeira
+# faixa com valor > limiar vence. Limiar None é o caso padrão.
+_INSIGHTS_ACOPLAMENTO = (
+    (0.7, "Alto acoplamento detectado - sistema com muitas dependências entre componentes"),
+    (0.4, "Acoplamento moderado - balanceamento razoável de dependências"),
+    (None, "Baixo acoplamento - boa separação de concerns e independência entre componentes"),
+)
+_INSIGHTS_COESAO = (
+    (0.8, "Alta coesão - componentes bem focados em responsabilidades específicas"),
+    (0.5, "Coesão moderada - alguns componentes podem beneficiar de refatoração"),
+    (None, "Baixa coesão - componentes com responsabilidades muito diversificadas"),
+)
+_INSIGHTS_MODULARIDADE = (
+    (0.6, "Boa modularidade - estrutura bem organizada em módulos coesos"),
+    (0.3, "Modularidade moderada - oportunidades para melhor organização modular"),
+    (None, "Baixa modularidade - estrutura pode ser melhor organizada em módulos"),
+)
+_INSIGHTS_COMPLEXIDADE = (
+    (15, "Alta complexidade ciclomática - considere simplificar a lógica dos componentes"),
+    (8, "Complexidade ciclomática moderada - monitorar evolução da complexidade"),
+)
+
+# Regras de pontos de atenção: cada grupo é uma cadeia if/elif de (condição, mensagem);
+# a primeira condição verdadeira do grupo gera o ponto. Condições recebem
+# (metricas, num_nos, nos_isolados) e as mensagens aceitam esses mesmos nomes.
+_PONTOS_ATENCAO = (
+    # Componentes isolados
+    (
+        (lambda m, num_nos, nos_isolados: nos_isolados > num_nos * 0.2,
+         "Alto número de componentes isolados ({nos_isolados} de {num_nos}) - pode indicar dead code ou funcionalidades não integradas"),
+        (lambda m, num_nos, nos_isolados: nos_isolados > 0,
+         "Componentes isolados presentes ({nos_isolados}) - verificar se são necessários"),
+    ),
+    # Centralidade excessiva
+    (
+        (lambda m, num_nos, nos_isolados: m.centralidade_intermediacao_maxima > 0.8,
+         "Alta centralidade em poucos componentes - possíveis gargalos ou single points of failure"),
+        (lambda m, num_nos, nos_isolados: m.centralidade_intermediacao_maxima > 0.6,
+         "Centralidade moderada-alta - monitorar componentes críticos"),
+    ),
+    # Densidade
+    (
+        (lambda m, num_nos, nos_isolados: m.densidade > 0.7,
+         "Alta densidade de conexões - sistema fortemente acoplado, pode ser difícil de manter"),
+        (lambda m, num_nos, nos_isolados: m.densidade < 0.1,
+         "Baixa densidade - muitos componentes com poucas conexões, possivelmente subutilizados"),
+    ),
+    # Acoplamento crítico
+    (
+        (lambda m, num_nos, nos_isolados: m.acoplamento_medio > 0.8,
+         "Acoplamento muito alto - impacto em mudanças pode ser significativo"),
+    ),
+    # Coesão crítica
+    (
+        (lambda m, num_nos, nos_isolados: m.coesao_media < 0.3,
+         "Coesão muito baixa - componentes com responsabilidades muito dispersas"),
+    ),
+)
+
+# Formatação das listas do storytelling
+_MARCADOR = " • "
+_SEPARADOR_MARCADOR = "\n • "
+_INSIGHTS_PADRAO = "Sistema com características balanceadas e organização adequada"
+_PONTOS_ATENCAO_PADRAO = "Nenhum ponto crítico identificado - arquitetura apresenta características saudáveis"
+
+def _selecionar_mensagem(valor, faixas) -> Optional[str]:
+    """Retorna a mensagem da primeira faixa cujo limiar é superado (ou None)"""
+    for limiar, mensagem in faixas:
+        if limiar is None or valor > limiar:
+            return mensagem
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def _formatar_timestamp(segundo: int) -> str:
+    """Formata o timestamp de um segundo (reaproveitado enquanto o segundo não muda)"""
+    return datetime.fromtimestamp(segundo).strftime("%Y-%m-%d %H:%M:%S")
+
+
 class DashboardModel:
     def __init__(self, notifier):
         self.notifier = notifier
-        self.historico_analises = []
-        self.historico_analises_rag = []
+        # Histórico limitado: o deque descarta as entradas mais antigas sozinho
+        self.historico_analises = deque(maxlen=10)
+        self.historico_analises_rag = deque(maxlen=20)
+        # Índices id -> análise para consulta direta
+        self._by_id = {}
+        self._by_id_rag = {}
+        # Incrementada a cada alteração do histórico RAG; permite à view saber se precisa reler
+        self.versao_historico_rag = 0
+        # As métricas dependem só de escalares das estatísticas; reaproveita entradas repetidas
+        self._metricas_cache = functools.lru_cache(maxsize=32)(self._calcular_metricas_impl)
+        self._resumo_cache = functools.lru_cache(maxsize=8)(self._resumir_metricas)
         
     def calcular_metricas_avancadas(self, resultado_grafo: Dict[str, Any]) -> Any:
         """Calcula métricas avançadas do grafo"""
         try:
-            # Cria um objeto simples para armazenar métricas
-            class Metricas:
-                def __init__(self):
-                    self.acoplamento_medio = 0.0
-                    self.coesao_media = 0.0
-                    self.complexidade_ciclomatica_media = 0.0
-                    self.centralidade_grau_maxima = 0.0
-                    self.centralidade_intermediacao_maxima = 0.0
-                    self.modularidade = 0.0
-                    self.densidade = 0.0
-                    self.diametro = 0
-                    self.raio = 0
-                    self.numero_componentes = 0
-            
-            metricas = Metricas()
-            
             # Extrai estatísticas básicas
-            estatisticas = resultado_grafo.get('estatisticas', {})
-            
-            # Calcula métricas baseadas nas estatísticas disponíveis
-            num_nos = estatisticas.get('num_nos', 1)
-            num_arestas = estatisticas.get('num_arestas', 0)
-            grau_medio = estatisticas.get('grau_medio', 0)
-            nos_isolados = estatisticas.get('nos_isolados', 0)
-            densidade = estatisticas.get('densidade', 0)
-            num_comunidades = estatisticas.get('num_comunidades', 1)
-            grau_maximo = estatisticas.get('grau_maximo', 0)
-            
-            # Acoplamento médio (baseado no grau médio)
-            metricas.acoplamento_medio = min(grau_medio / 10.0, 1.0)  # Normalizado
-            
-            # Coesão média (inversamente proporcional aos nós isolados)
-            metricas.coesao_media = max(0, 1.0 - (nos_isolados / max(num_nos, 1)))
+            get = resultado_grafo.get('estatisticas', {}).get
             
-            # Densidade
-            metricas.densidade = densidade
-            
-            # Número de componentes (comunidades)
-            metricas.numero_componentes = max(num_comunidades, 1)
-            
-            # Modularidade (baseada na densidade e número de comunidades)
-            if num_comunidades > 1:
-                metricas.modularidade = min(densidade * num_comunidades / 10.0, 0.8)
-            else:
-                metricas.modularidade = min(densidade * 0.5, 0.6)
-            
-            # Centralidade máxima (baseada no grau máximo)
-            metricas.centralidade_intermediacao_maxima = min(grau_maximo / max(num_nos * 0.5, 1), 1.0)
-            metricas.centralidade_grau_maxima = metricas.centralidade_intermediacao_maxima
-            
-            # Complexidade ciclomática (estimativa baseada em arestas e nós)
-            if num_nos > 0:
-                metricas.complexidade_ciclomatica_media = max(1, (num_arestas - num_nos + 2) / max(num_nos, 1))
-            else:
-                metricas.complexidade_ciclomatica_media = 1.0
-            
-            # Diâmetro e raio (estimativas)
-            metricas.diametro = min(max(3, int(num_nos / 10)), 10)
-            metricas.raio = max(1, metricas.diametro - 2)
-            
-            logger.info(f"Métricas avançadas calculadas: "
-                       f"acoplamento={metricas.acoplamento_medio:.2f}, "
-                       f"coesao={metricas.coesao_media:.2f}, "
-                       f"modularidade={metricas.modularidade:.3f}")
-            
-            return metricas
+            return self._metricas_cache(
+                get('num_nos', 1),
+                get('num_arestas', 0),
+                get('grau_medio', 0),
+                get('nos_isolados', 0),
+                get('densidade', 0),
+                get('num_comunidades', 1),
+                get('grau_maximo', 0)
+            )
             
         except Exception as e:
             logger.error(f"Erro ao calcular métricas avançadas: {e}")
             # Retorna métricas padrão em caso de erro
-            class Metricas:
-                def __init__(self):
-                    self.acoplamento_medio = 0.5
-                    self.coesao_media = 0.6
-                    self.complexidade_ciclomatica_media = 10.0
-                    self.centralidade_grau_maxima = 0.3
-                    self.centralidade_intermediacao_maxima = 0.2
-                    self.modularidade = 0.4
-                    self.densidade = 0.1
-                    self.diametro = 5
-                    self.raio = 2
-                    self.numero_componentes = 3
-            
-            return Metricas()
+            return _METRICAS_PADRAO
+    
+    def _calcular_metricas_impl(self, num_nos, num_arestas, grau_medio, nos_isolados,
+                                densidade, num_comunidades, grau_maximo) -> Metricas:
+        """Calcula as métricas a partir das estatísticas básicas (memoizado em __init__)"""
+        p = _PARAMETROS_METRICAS
+        
+        # Acoplamento médio (baseado no grau médio)
+        acoplamento_medio = min(grau_medio / p['grau_medio_referencia'], 1.0)  # Normalizado
+        
+        # Coesão média (inversamente proporcional aos nós isolados)
+        coesao_media = max(0, 1.0 - (nos_isolados / max(num_nos, 1)))
+        
+        # Modularidade (baseada na densidade e número de comunidades)
+        if num_comunidades > 1:
+            modularidade = min(densidade * num_comunidades / p['comunidades_referencia'], p['modularidade_max'])
+        else:
+            modularidade = min(densidade * p['fator_modularidade_sem_comunidades'], p['modularidade_max_sem_comunidades'])
+        
+        # Centralidade máxima (baseada no grau máximo)
+        centralidade_maxima = min(grau_maximo / max(num_nos * p['fracao_nos_centralidade'], 1), 1.0)
+        
+        # Complexidade ciclomática (estimativa baseada em arestas e nós)
+        if num_nos > 0:
+            complexidade = max(1, (num_arestas - num_nos + 2) / max(num_nos, 1))
+        else:
+            complexidade = 1.0
+        
+        # Diâmetro e raio (estimativas)
+        diametro = min(max(p['diametro_min'], int(num_nos / p['nos_por_diametro'])), p['diametro_max'])
+        
+        metricas = Metricas(
+            acoplamento_medio=acoplamento_medio,
+            coesao_media=coesao_media,
+            complexidade_ciclomatica_media=complexidade,
+            centralidade_grau_maxima=centralidade_maxima,
+            centralidade_intermediacao_maxima=centralidade_maxima,
+            modularidade=modularidade,
+            densidade=densidade,
+            diametro=diametro,
+            raio=max(1, diametro - 2),
+            numero_componentes=max(num_comunidades, 1)  # Número de componentes (comunidades)
+        )
+        
+        logger.info("Métricas avançadas calculadas: "
+                   "acoplamento=%.2f, coesao=%.2f, modularidade=%.3f",
+                   metricas.acoplamento_medio, metricas.coesao_media, metricas.modularidade)
+        
+        return metricas
     
     def gerar_storytelling(self, metricas, resultado_grafo: Dict[str, Any]) -> Dict[str, str]:
         """Gera narrativa contextual baseada nas métricas"""
@@ -134,10 +253,11 @@ class DashboardModel:
     
     def _gerar_resumo_geral(self, metricas, estatisticas: Dict[str, Any]) -> str:
         """Gera resumo geral da arquitetura"""
-        num_nos = estatisticas.get('num_nos', 0)
-        num_arestas = estatisticas.get('num_arestas', 0)
-        num_comunidades = estatisticas.get('num_comunidades', 1)
-        nos_isolados = estatisticas.get('nos_isolados', 0)
+        get = estatisticas.get
+        num_nos = get('num_nos', 0)
+        num_arestas = get('num_arestas', 0)
+        num_comunidades = get('num_comunidades', 1)
+        nos_isolados = get('nos_isolados', 0)
         
         # Avaliação geral baseada nas métricas
         if metricas.acoplamento_medio < 0.3 and metricas.coesao_media > 0.7:
@@ -155,39 +275,18 @@ class DashboardModel:
     
     def _gerar_insights_tecnicos(self, metricas, estatisticas: Dict[str, Any]) -> str:
         """Gera insights técnicos"""
-        insights = []
-        
-        # Análise de acoplamento
-        if metricas.acoplamento_medio > 0.7:
-            insights.append("Alto acoplamento detectado - sistema com muitas dependências entre componentes")
-        elif metricas.acoplamento_medio > 0.4:
-            insights.append("Acoplamento moderado - balanceamento razoável de dependências")
-        else:
-            insights.append("Baixo acoplamento - boa separação de concerns e independência entre componentes")
-        
-        # Análise de coesão
-        if metricas.coesao_media > 0.8:
-            insights.append("Alta coesão - componentes bem focados em responsabilidades específicas")
-        elif metricas.coesao_media > 0.5:
-            insights.append("Coesão moderada - alguns componentes podem beneficiar de refatoração")
-        else:
-            insights.append("Baixa coesão - componentes com responsabilidades muito diversificadas")
-        
-        # Análise de modularidade
-        if metricas.modularidade > 0.6:
-            insights.append("Boa modularidade - estrutura bem organizada em módulos coesos")
-        elif metricas.modularidade > 0.3:
-            insights.append("Modularidade moderada - oportunidades para melhor organização modular")
-        else:
-            insights.append("Baixa modularidade - estrutura pode ser melhor organizada em módulos")
+        insights = [
+            _selecionar_mensagem(metricas.acoplamento_medio, _INSIGHTS_ACOPLAMENTO),
+            _selecionar_mensagem(metricas.coesao_media, _INSIGHTS_COESAO),
+            _selecionar_mensagem(metricas.modularidade, _INSIGHTS_MODULARIDADE),
+        ]
         
-        # Análise de complexidade
-        if hasattr(metricas, 'complexidade_ciclomatica_media') and metricas.complexidade_ciclomatica_media > 15:
-            insights.append("Alta complexidade ciclomática - considere simplificar a lógica dos componentes")
-        elif hasattr(metricas, 'complexidade_ciclomatica_media') and metricas.complexidade_ciclomatica_media > 8:
-            insights.append("Complexidade ciclomática moderada - monitorar evolução da complexidade")
+        # Complexidade só gera insight acima do limiar moderado
+        complexidade = _selecionar_mensagem(metricas.complexidade_ciclomatica_media, _INSIGHTS_COMPLEXIDADE)
+        if complexidade:
+            insights.append(complexidade)
         
-        return " • " + "\n • ".join(insights) if insights else "Sistema com características balanceadas e organização adequada"
+        return _MARCADOR + _SEPARADOR_MARCADOR.join(insights) if insights else _INSIGHTS_PADRAO
     
     def _gerar_pontos_atencao(self, metricas, estatisticas: Dict[str, Any]) -> str:
         """Gera pontos de atenção"""
@@ -196,33 +295,13 @@ class DashboardModel:
         num_nos = estatisticas.get('num_nos', 1)
         nos_isolados = estatisticas.get('nos_isolados', 0)
         
-        # Componentes isolados
-        if nos_isolados > num_nos * 0.2:
-            pontos.append(f"Alto número de componentes isolados ({nos_isolados} de {num_nos}) - pode indicar dead code ou funcionalidades não integradas")
-        elif nos_isolados > 0:
-            pontos.append(f"Componentes isolados presentes ({nos_isolados}) - verificar se são necessários")
-        
-        # Centralidade excessiva
-        if hasattr(metricas, 'centralidade_intermediacao_maxima') and metricas.centralidade_intermediacao_maxima > 0.8:
-            pontos.append("Alta centralidade em poucos componentes - possíveis gargalos ou single points of failure")
-        elif hasattr(metricas, 'centralidade_intermediacao_maxima') and metricas.centralidade_intermediacao_maxima > 0.6:
-            pontos.append("Centralidade moderada-alta - monitorar componentes críticos")
-        
-        # Densidade
-        if metricas.densidade > 0.7:
-            pontos.append("Alta densidade de conexões - sistema fortemente acoplado, pode ser difícil de manter")
-        elif metricas.densidade < 0.1:
-            pontos.append("Baixa densidade - muitos componentes com poucas conexões, possivelmente subutilizados")
-        
-        # Acoplamento crítico
-        if metricas.acoplamento_medio > 0.8:
-            pontos.append("Acoplamento muito alto - impacto em mudanças pode ser significativo")
+        for regras in _PONTOS_ATENCAO:
+            for condicao, mensagem in regras:
+                if condicao(metricas, num_nos, nos_isolados):
+                    pontos.append(mensagem.format(num_nos=num_nos, nos_isolados=nos_isolados))
+                    break
         
-        # Coesão crítica
-        if metricas.coesao_media < 0.3:
-            pontos.append("Coesão muito baixa - componentes com responsabilidades muito dispersas")
-        
-        return " • " + "\n • ".join(pontos) if pontos else "Nenhum ponto crítico identificado - arquitetura apresenta características saudáveis"
+        return _MARCADOR + _SEPARADOR_MARCADOR.join(pontos) if pontos else _PONTOS_ATENCAO_PADRAO
     
     def _gerar_recomendacoes(self, metricas, estatisticas: Dict[str, Any]) -> str:
         """Gera recomendações de melhoria"""
@@ -257,51 +336,48 @@ class DashboardModel:
             recomendacoes.append("Estabelecer métricas de acompanhamento: monitorar evolução das métricas após implementar melhorias")
             recomendacoes.append("Realizar code reviews focados: incluir verificação de aspectos arquiteturais nos reviews")
         
-        return " • " + "\n • ".join(recomendacoes)
+        return _MARCADOR + _SEPARADOR_MARCADOR.join(recomendacoes)
     
     def preparar_contexto_rag(self, metricas, resultado_grafo: Dict[str, Any], storytelling: Dict[str, str]) -> str:
         """Prepara contexto para análise RAG"""
         try:
-            contexto = "CONTEXTO DA ANÁLISE DE ARQUITETURA:\n\n"
-            
-            # Estatísticas básicas
-            estatisticas = resultado_grafo.get('estatisticas', {})
-            contexto += "=== ESTATÍSTICAS GERAIS DO SISTEMA ===\n"
-            contexto += f"• Total de componentes (nós): {estatisticas.get('num_nos', 'N/A')}\n"
-            contexto += f"• Total de dependências (arestas): {estatisticas.get('num_arestas', 'N/A')}\n"
-            contexto += f"• Comunidades detectadas: {estatisticas.get('num_comunidades', 'N/A')}\n"
-            contexto += f"• Componentes isolados: {estatisticas.get('nos_isolados', 'N/A')}\n"
-            contexto += f"• Densidade do grafo: {estatisticas.get('densidade', 'N/A')}\n"
-            contexto += f"• Grau médio (conexões por componente): {estatisticas.get('grau_medio', 'N/A')}\n\n"
-            
-            # Métricas avançadas
-            contexto += "=== MÉTRICAS DE QUALIDADE ARQUITETURAL ===\n"
-            contexto += f"• Acoplamento médio: {metricas.acoplamento_medio:.3f} (0-1, menor é melhor)\n"
-            contexto += f"• Coesão média: {getattr(metricas, 'coesao_media', 0):.3f} (0-1, maior é melhor)\n"
-            contexto += f"• Modularidade: {getattr(metricas, 'modularidade', 0):.3f} (0-1, maior é melhor)\n"
-            contexto += f"• Densidade: {getattr(metricas, 'densidade', 0):.3f} (0-1)\n"
-            if hasattr(metricas, 'complexidade_ciclomatica_media'):
-                contexto += f"• Complexidade ciclomática média: {metricas.complexidade_ciclomatica_media:.1f}\n"
-            if hasattr(metricas, 'centralidade_intermediacao_maxima'):
-                contexto += f"• Centralidade máxima (intermediação): {metricas.centralidade_intermediacao_maxima:.3f}\n"
-            contexto += f"• Componentes conectados: {getattr(metricas, 'numero_componentes', 0)}\n\n"
+            get = resultado_grafo.get('estatisticas', {}).get
             
-            # Storytelling
-            contexto += "=== ANÁLISE CONTEXTUAL E INTERPRETAÇÃO ===\n"
-            contexto += f"RESUMO GERAL:\n{storytelling.get('resumo_geral', 'N/A')}\n\n"
-            contexto += f"INSIGHTS TÉCNICOS:\n{storytelling.get('insights_tecnicos', 'N/A')}\n\n"
-            contexto += f"PONTOS DE ATENÇÃO:\n{storytelling.get('pontos_atencao', 'N/A')}\n\n"
-            contexto += f"RECOMENDAÇÕES:\n{storytelling.get('recomendacoes', 'N/A')}\n\n"
-            
-            contexto += "INSTRUÇÕES PARA ANÁLISE RAG:\n"
-            contexto += "Com base nestas métricas e na análise contextual, forneça:\n"
-            contexto += "1. Uma avaliação geral da qualidade arquitetural\n"
-            contexto += "2. Identificação de padrões arquiteturais presentes\n"
-            contexto += "3. Sugestões específicas de refatoração baseadas nos pontos de atenção\n"
-            contexto += "4. Recomendações para melhorar métricas específicas (acoplamento, coesão, modularidade)\n"
-            contexto += "5. Análise de trade-offs e impactos das mudanças sugeridas\n\n"
-            
-            contexto += "PERGUNTA DO USUÁRIO:\n"
+            # Literais adjacentes formam uma única f-string: o texto é montado de uma vez
+            contexto = (
+                "CONTEXTO DA ANÁLISE DE ARQUITETURA:\n\n"
+                # Estatísticas básicas
+                "=== ESTATÍSTICAS GERAIS DO SISTEMA ===\n"
+                f"• Total de componentes (nós): {get('num_nos', 'N/A')}\n"
+                f"• Total de dependências (arestas): {get('num_arestas', 'N/A')}\n"
+                f"• Comunidades detectadas: {get('num_comunidades', 'N/A')}\n"
+                f"• Componentes isolados: {get('nos_isolados', 'N/A')}\n"
+                f"• Densidade do grafo: {get('densidade', 'N/A')}\n"
+                f"• Grau médio (conexões por componente): {get('grau_medio', 'N/A')}\n\n"
+                # Métricas avançadas
+                "=== MÉTRICAS DE QUALIDADE ARQUITETURAL ===\n"
+                f"• Acoplamento médio: {metricas.acoplamento_medio:.3f} (0-1, menor é melhor)\n"
+                f"• Coesão média: {metricas.coesao_media:.3f} (0-1, maior é melhor)\n"
+                f"• Modularidade: {metricas.modularidade:.3f} (0-1, maior é melhor)\n"
+                f"• Densidade: {metricas.densidade:.3f} (0-1)\n"
+                f"• Complexidade ciclomática média: {metricas.complexidade_ciclomatica_media:.1f}\n"
+                f"• Centralidade máxima (intermediação): {metricas.centralidade_intermediacao_maxima:.3f}\n"
+                f"• Componentes conectados: {metricas.numero_componentes}\n\n"
+                # Storytelling
+                "=== ANÁLISE CONTEXTUAL E INTERPRETAÇÃO ===\n"
+                f"RESUMO GERAL:\n{storytelling.get('resumo_geral', 'N/A')}\n\n"
+                f"INSIGHTS TÉCNICOS:\n{storytelling.get('insights_tecnicos', 'N/A')}\n\n"
+                f"PONTOS DE ATENÇÃO:\n{storytelling.get('pontos_atencao', 'N/A')}\n\n"
+                f"RECOMENDAÇÕES:\n{storytelling.get('recomendacoes', 'N/A')}\n\n"
+                "INSTRUÇÕES PARA ANÁLISE RAG:\n"
+                "Com base nestas métricas e na análise contextual, forneça:\n"
+                "1. Uma avaliação geral da qualidade arquitetural\n"
+                "2. Identificação de padrões arquiteturais presentes\n"
+                "3. Sugestões específicas de refatoração baseadas nos pontos de atenção\n"
+                "4. Recomendações para melhorar métricas específicas (acoplamento, coesão, modularidade)\n"
+                "5. Análise de trade-offs e impactos das mudanças sugeridas\n\n"
+                "PERGUNTA DO USUÁRIO:\n"
+            )
             
             logger.info("Contexto RAG preparado com sucesso")
             return contexto
@@ -313,54 +389,54 @@ class DashboardModel:
     def salvar_analise_historico(self, analise: Dict[str, Any]):
         """Salva análise no histórico"""
         try:
+            # Segue o último id: len()+1 repetiria ids depois do corte do histórico
             analise_com_id = {
-                'id': len(self.historico_analises) + 1,
+                'id': self.historico_analises[-1]['id'] + 1 if self.historico_analises else 1,
                 **analise
             }
-            self.historico_analises.append(analise_com_id)
-            
             # Mantém apenas as últimas 10 análises
-            if len(self.historico_analises) > 10:
-                self.historico_analises = self.historico_analises[-10:]
+            if len(self.historico_analises) == self.historico_analises.maxlen:
+                self._by_id.pop(self.historico_analises[0]['id'], None)
+            self.historico_analises.append(analise_com_id)
+            self._by_id[analise_com_id['id']] = analise_com_id
                 
-            logger.info(f"Análise {analise_com_id['id']} salva no histórico")
+            logger.info("Análise %s salva no histórico", analise_com_id['id'])
         except Exception as e:
             logger.error(f"Erro ao salvar análise no histórico: {e}")
     
     def salvar_analise_rag_historico(self, analise_rag: Dict[str, Any]):
         """Salva análise RAG no histórico"""
         try:
+            # Segue o último id: len()+1 repetiria ids depois do corte do histórico
             analise_com_id = {
-                'id': len(self.historico_analises_rag) + 1,
+                'id': self.historico_analises_rag[-1]['id'] + 1 if self.historico_analises_rag else 1,
                 **analise_rag
             }
-            self.historico_analises_rag.append(analise_com_id)
-            
             # Mantém apenas as últimas 20 análises RAG
-            if len(self.historico_analises_rag) > 20:
-                self.historico_analises_rag = self.historico_analises_rag[-20:]
+            if len(self.historico_analises_rag) == self.historico_analises_rag.maxlen:
+                self._by_id_rag.pop(self.historico_analises_rag[0]['id'], None)
+            self.historico_analises_rag.append(analise_com_id)
+            self._by_id_rag[analise_com_id['id']] = analise_com_id
+            self.versao_historico_rag += 1
                 
-            logger.info(f"Análise RAG {analise_com_id['id']} salva no histórico: {analise_rag['timestamp']}")
+            logger.info("Análise RAG %s salva no histórico: %s", analise_com_id['id'], analise_rag['timestamp'])
         except Exception as e:
             logger.error(f"Erro ao salvar análise RAG: {e}")
     
-    def obter_historico_analises_rag(self) -> List[Dict[str, Any]]:
-        """Obtém histórico de análises RAG"""
+    def obter_historico_analises_rag(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtém histórico de análises RAG (as `limite` mais recentes, se informado)"""
         try:
-            # Retorna as análises mais recentes primeiro
-            return sorted(self.historico_analises_rag, 
-                         key=lambda x: x.get('timestamp', ''), 
-                         reverse=True)
+            # Retorna as análises mais recentes primeiro (inseridas em ordem cronológica)
+            return list(itertools.islice(reversed(self.historico_analises_rag), limite))
         except Exception as e:
             logger.error(f"Erro ao obter histórico RAG: {e}")
             return []
     
-    def obter_historico_analises(self) -> List[Dict[str, Any]]:
-        """Obtém histórico de análises completas"""
+    def obter_historico_analises(self, limite: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtém histórico de análises completas (as `limite` mais recentes, se informado)"""
         try:
-            return sorted(self.historico_analises,
-                         key=lambda x: x.get('timestamp', ''),
-                         reverse=True)
+            # Inseridas em ordem cronológica; basta inverter e parar no limite
+            return list(itertools.islice(reversed(self.historico_analises), limite))
         except Exception as e:
             logger.error(f"Erro ao obter histórico de análises: {e}")
             return []
@@ -368,10 +444,7 @@ class DashboardModel:
     def obter_analise_por_id(self, analise_id: int) -> Dict[str, Any]:
         """Obtém uma análise específica por ID"""
         try:
-            for analise in self.historico_analises:
-                if analise.get('id') == analise_id:
-                    return analise
-            return None
+            return self._by_id.get(analise_id)
         except Exception as e:
             logger.error(f"Erro ao obter análise {analise_id}: {e}")
             return None
@@ -379,10 +452,7 @@ class DashboardModel:
     def obter_analise_rag_por_id(self, analise_id: int) -> Dict[str, Any]:
         """Obtém uma análise RAG específica por ID"""
         try:
-            for analise in self.historico_analises_rag:
-                if analise.get('id') == analise_id:
-                    return analise
-            return None
+            return self._by_id_rag.get(analise_id)
         except Exception as e:
             logger.error(f"Erro ao obter análise RAG {analise_id}: {e}")
             return None
@@ -391,6 +461,7 @@ class DashboardModel:
         """Limpa o histórico de análises"""
         try:
             self.historico_analises.clear()
+            self._by_id.clear()
             logger.info("Histórico de análises limpo")
         except Exception as e:
             logger.error(f"Erro ao limpar histórico: {e}")
@@ -399,13 +470,15 @@ class DashboardModel:
         """Limpa o histórico de análises RAG"""
         try:
             self.historico_analises_rag.clear()
+            self._by_id_rag.clear()
+            self.versao_historico_rag += 1
             logger.info("Histórico de análises RAG limpo")
         except Exception as e:
             logger.error(f"Erro ao limpar histórico RAG: {e}")
     
     def obter_timestamp(self) -> str:
         """Retorna timestamp atual formatado"""
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return _formatar_timestamp(int(time.time()))
     
     def obter_metricas_resumidas(self, resultado_grafo: Dict[str, Any]) -> Dict[str, Any]:
         """Retorna métricas resumidas para exibição rápida"""
@@ -413,15 +486,11 @@ class DashboardModel:
             metricas = self.calcular_metricas_avancadas(resultado_grafo)
             estatisticas = resultado_grafo.get('estatisticas', {})
             
+            # Métricas iguais (mesmo objeto vindo do cache) reaproveitam o arredondamento
             return {
                 'num_nos': estatisticas.get('num_nos', 0),
                 'num_arestas': estatisticas.get('num_arestas', 0),
-                'acoplamento_medio': round(metricas.acoplamento_medio, 3),
-                'coesao_media': round(metricas.coesao_media, 3),
-                'modularidade': round(metricas.modularidade, 3),
-                'densidade': round(metricas.densidade, 3),
-                'complexidade_media': round(getattr(metricas, 'complexidade_ciclomatica_media', 0), 1),
-                'componentes_conectados': metricas.numero_componentes
+                **self._resumo_cache(metricas)
             }
         except Exception as e:
             logger.error(f"Erro ao obter métricas resumidas: {e}")
@@ -436,9 +505,22 @@ class DashboardModel:
                 'componentes_conectados': 0
             }
     
+    def _resumir_metricas(self, metricas: Metricas) -> Dict[str, Any]:
+        """Arredonda as métricas para o resumo (memoizado em _resumo_cache)"""
+        return {
+            'acoplamento_medio': round(metricas.acoplamento_medio, 3),
+            'coesao_media': round(metricas.coesao_media, 3),
+            'modularidade': round(metricas.modularidade, 3),
+            'densidade': round(metricas.densidade, 3),
+            'complexidade_media': round(metricas.complexidade_ciclomatica_media, 1),
+            'componentes_conectados': metricas.numero_componentes
+        }
+    
     def exportar_analise_json(self, analise: Dict[str, Any]) -> str:
         """Exporta análise completa para JSON"""
         try:
+            if ORJSON_AVAILABLE:
+                return orjson.dumps(analise, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
             return json.dumps(analise, indent=2, ensure_ascii=False)
         except Exception as e:
             logger.error(f"Erro ao exportar análise para JSON: {e}")
@@ -447,6 +529,8 @@ class DashboardModel:
     def importar_analise_json(self, json_str: str) -> Dict[str, Any]:
         """Importa análise de JSON string"""
         try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(json_str)
             return json.loads(json_str)
         except Exception as e:
             logger.error(f"Erro ao importar análise de JSON: {e}")
@@ -0,0 +1,11 @@
+# modules/dashboard/view/components/atualizacao.py
+
+
+def atualizar_controles(page, *controles):
+    """Envia à página só os controles informados, em vez de reconciliar a árvore inteira"""
+    try:
+        for controle in controles:
+            controle.update()
+    except AssertionError:
+        # Controle ainda não adicionado à página
+        page.update()
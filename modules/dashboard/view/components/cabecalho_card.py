@@ -0,0 +1,12 @@
+# modules/dashboard/view/components/cabecalho_card.py
+
+import flet as ft
+
+
+def criar_cabecalho_card(icone: str, cor: str, titulo: str, subtitulo: str) -> ft.ListTile:
+    """Cria o cabeçalho padrão (ícone, título e subtítulo) dos cards do dashboard"""
+    return ft.ListTile(
+        leading=ft.Icon(icone, color=cor),
+        title=ft.Text(titulo, weight=ft.FontWeight.BOLD),
+        subtitle=ft.Text(subtitulo)
+    )
@@ -0,0 +1,21 @@
+# modules/dashboard/view/components/debouncer.py
+
+import threading
+
+
+class Debouncer:
+    """Executa apenas a última chamada agendada dentro da janela de espera"""
+    
+    def __init__(self, espera: float):
+        self._espera = espera
+        self._timer = None
+        self._lock = threading.Lock()
+    
+    def agendar(self, funcao, *args):
+        """Agenda a função, cancelando a chamada pendente anterior"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self._espera, funcao, args)
+            self._timer.daemon = True
+            self._timer.start()
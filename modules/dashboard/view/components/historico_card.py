@@ -2,36 +2,55 @@
 
 import flet as ft
 import logging
+import threading
+from .cabecalho_card import criar_cabecalho_card
+from .atualizacao import atualizar_controles
 
 logger = logging.getLogger(__name__)
 
+# Quantidade de execuções exibidas na tabela
+_LIMITE_HISTORICO = 10
+
+# Colunas da tabela: (título, largura)
+_COLUNAS_HISTORICO = (
+    ("Data", 120),
+    ("Nós", 60),
+    ("Arestas", 70),
+    ("Comunidades", 100),
+    ("Acoplamento", 100),
+    ("Modularidade", 100),
+)
+
+# Altura fixa de cada linha, permite à ListView renderizar só as linhas visíveis
+_ALTURA_LINHA = 32
+
 class HistoricoCard:
+    __slots__ = ('controller', 'notifier', 'page', 'tabela_historico', '_linhas_cache', '_ultimas_chaves', '_suprimir_atualizacao')
+    
     def __init__(self, controller, notifier):
         self.controller = controller
         self.notifier = notifier
         self.page = None
+        # Ligado pelo ViewManager durante a atualização em lote (um único page.update() ao final)
+        self._suprimir_atualizacao = False
+        # Linhas já montadas por (id, timestamp) da análise, reaproveitadas entre recargas;
+        # o timestamp evita reaproveitar linhas quando os ids recomeçam após limpar o histórico
+        self._linhas_cache = {}
         
     def build(self) -> ft.Card:
-        self.tabela_historico = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Data")),
-                ft.DataColumn(ft.Text("Nós")),
-                ft.DataColumn(ft.Text("Arestas")),
-                ft.DataColumn(ft.Text("Comunidades")),
-                ft.DataColumn(ft.Text("Acoplamento")),
-                ft.DataColumn(ft.Text("Modularidade")),
-            ],
-            rows=[]
-        )
+        # Chaves das linhas exibidas na última carga (None = tabela ainda não preenchida)
+        self._ultimas_chaves = None
+        self.tabela_historico = ft.ListView(item_extent=_ALTURA_LINHA, height=300)
+        cabecalho_tabela = ft.Row([
+            ft.Text(titulo, width=largura, weight=ft.FontWeight.BOLD)
+            for titulo, largura in _COLUNAS_HISTORICO
+        ])
         
         return ft.Card(
             content=ft.Container(
                 content=ft.Column([
-                    ft.ListTile(
-                        leading=ft.Icon(ft.Icons.HISTORY, color=ft.Colors.BLUE_500),
-                        title=ft.Text("Histórico de Execuções", weight=ft.FontWeight.BOLD),
-                        subtitle=ft.Text("Evolução temporal das métricas")
-                    ),
+                    criar_cabecalho_card(ft.Icons.HISTORY, ft.Colors.BLUE_500, "Histórico de Execuções",
+                                         "Evolução temporal das métricas"),
                     ft.Divider(),
                     ft.Container(
                         content=ft.Column([
@@ -41,10 +60,11 @@ class HistoricoCard:
                                 on_click=self._carregar_historico
                             ),
                             ft.Container(
-                                content=ft.ListView(
-                                    [self.tabela_historico],
-                                    height=300
-                                ),
+                                content=ft.Column([
+                                    cabecalho_tabela,
+                                    ft.Divider(height=1),
+                                    self.tabela_historico
+                                ]),
                                 padding=10
                             )
                         ])
@@ -56,28 +76,52 @@ class HistoricoCard:
     
     def _carregar_historico(self, e=None):
         """Carrega o histórico de execuções"""
+        if e is not None:
+            # Clique no botão: carrega em thread separada para não travar a UI
+            threading.Thread(target=self._carregar_historico, daemon=True).start()
+            return
+        
         try:
-            historico = self.controller.obter_historico_analises_completas()
-            self.tabela_historico.rows.clear()
+            historico = self.controller.obter_historico_analises_completas(limite=_LIMITE_HISTORICO)
+            
+            # Mostra apenas as últimas execuções (o corte local cobre controllers sem limite)
+            linhas_cache = {}
+            for execucao in historico[:_LIMITE_HISTORICO]:
+                chave = (execucao.get('id'), execucao.get('timestamp'))
+                linha = self._linhas_cache.get(chave)
+                linhas_cache[chave] = linha if linha is not None else self._criar_linha(execucao)
+            self._linhas_cache = linhas_cache
             
-            for execucao in historico[:10]:  # Mostra apenas últimas 10
-                self.tabela_historico.rows.append(
-                    ft.DataRow(cells=[
-                        ft.DataCell(ft.Text(execucao.get('timestamp', '')[:16])),
-                        ft.DataCell(ft.Text(str(execucao.get('resultado_grafo', {}).get('estatisticas', {}).get('num_nos', 0)))),
-                        ft.DataCell(ft.Text(str(execucao.get('resultado_grafo', {}).get('estatisticas', {}).get('num_arestas', 0)))),
-                        ft.DataCell(ft.Text(str(execucao.get('resultado_grafo', {}).get('estatisticas', {}).get('num_comunidades', 0)))),
-                        ft.DataCell(ft.Text(f"{execucao.get('metricas_resumidas', {}).get('acoplamento_medio', 0):.2f}")),
-                        ft.DataCell(ft.Text(f"{execucao.get('metricas_resumidas', {}).get('modularidade', 0):.3f}")),
-                    ])
-                )
+            # Histórico inalterado: evita reenviar a tabela
+            chaves = tuple(linhas_cache)
+            if chaves == self._ultimas_chaves:
+                return
+            self._ultimas_chaves = chaves
+            self.tabela_historico.controls = list(linhas_cache.values())
             
-            if self.page:
-                self.page.update()
+            if self.page and not self._suprimir_atualizacao:
+                atualizar_controles(self.page, self.tabela_historico)
                 
         except Exception as ex:
             logger.error(f"Erro ao carregar histórico: {ex}")
     
+    def _criar_linha(self, execucao: dict) -> ft.Row:
+        """Cria a linha da tabela para uma execução"""
+        estatisticas = execucao.get('resultado_grafo', {}).get('estatisticas', {})
+        metricas = execucao.get('metricas_resumidas', {})
+        valores = (
+            execucao.get('timestamp', '')[:16],
+            str(estatisticas.get('num_nos', 0)),
+            str(estatisticas.get('num_arestas', 0)),
+            str(estatisticas.get('num_comunidades', 0)),
+            f"{metricas.get('acoplamento_medio', 0):.2f}",
+            f"{metricas.get('modularidade', 0):.3f}",
+        )
+        return ft.Row([
+            ft.Text(valor, width=largura)
+            for valor, (_, largura) in zip(valores, _COLUNAS_HISTORICO)
+        ])
+    
     def set_page(self, page: ft.Page):
         """Define a página para atualizações"""
         self.page = page
\ No newline at end of file
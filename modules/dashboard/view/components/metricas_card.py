@@ -2,16 +2,59 @@
 
 import flet as ft
 import logging
+from functools import lru_cache
+from .cabecalho_card import criar_cabecalho_card
+from .atualizacao import atualizar_controles
 
 logger = logging.getLogger(__name__)
 
+# Cor de fundo suave para cada cor principal de métrica
+_CORES_FUNDO = {
+    ft.Colors.GREEN: ft.Colors.GREEN_50,
+    ft.Colors.ORANGE: ft.Colors.ORANGE_50,
+    ft.Colors.RED: ft.Colors.RED_50,
+    ft.Colors.BLUE_400: ft.Colors.BLUE_50
+}
+
+# Métricas exibidas no grid: (atributo, rótulo, formato, ícone, limiar bom, limiar ótimo, invertido).
+# Limiares None usam uma cor fixa (métrica apenas informativa).
+_METRICAS_EXIBIDAS = (
+    ('acoplamento_medio', "Acoplamento", "{:.2f}", ft.Icons.LINK, 0.3, 0.7, False),
+    ('coesao_media', "Coesão", "{:.2f}", ft.Icons.GROUP_WORK, 0.6, 0.8, True),
+    ('modularidade', "Modularidade", "{:.3f}", ft.Icons.VIEW_MODULE, 0.3, 0.6, False),
+    ('densidade', "Densidade", "{:.3f}", ft.Icons.DENSITY_MEDIUM, 0.1, 0.3, False),
+    ('complexidade_ciclomatica_media', "Complexidade", "{:.1f}", ft.Icons.CODE, 10, 20, True),
+    ('numero_componentes', "Componentes", "{}", ft.Icons.ACCOUNT_TREE, None, None, False),
+)
+
 class MetricasCard:
+    __slots__ = ('controller', 'notifier', 'page', 'grid_metricas', '_tiles', '_ultimos_valores', '_estado_vazio', '_suprimir_atualizacao')
+    
     def __init__(self, controller, notifier):
         self.controller = controller
         self.notifier = notifier
         self.page = None
+        # Ligado pelo ViewManager durante a atualização em lote (um único page.update() ao final)
+        self._suprimir_atualizacao = False
         
     def build(self) -> ft.Card:
+        # Tiles criados uma vez; atualizar_metricas só altera valores e cores
+        self._tiles = [
+            self._criar_tile_metrica(nome, icone)
+            for _, nome, _, icone, _, _, _ in _METRICAS_EXIBIDAS
+        ]
+        # Valores exibidos na última atualização (None = grid ainda não preenchido)
+        self._ultimos_valores = None
+        # Placeholder exibido quando não há métricas (criado uma vez)
+        self._estado_vazio = ft.Container(
+            content=ft.Column([
+                ft.Icon(ft.Icons.WARNING, size=30, color=ft.Colors.ORANGE),
+                ft.Text("Nenhuma métrica", size=14, weight=ft.FontWeight.BOLD),
+                ft.Text("Execute a análise", size=12, color=ft.Colors.GREY_600)
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            padding=15,
+            alignment=ft.alignment.center
+        )
         self.grid_metricas = ft.GridView(
             expand=1,
             runs_count=2,
@@ -24,11 +67,8 @@ class MetricasCard:
         return ft.Card(
             content=ft.Container(
                 content=ft.Column([
-                    ft.ListTile(
-                        leading=ft.Icon(ft.Icons.ANALYTICS, color=ft.Colors.GREEN_500),
-                        title=ft.Text("Métricas de Arquitetura", weight=ft.FontWeight.BOLD),
-                        subtitle=ft.Text("Indicadores de qualidade e complexidade")
-                    ),
+                    criar_cabecalho_card(ft.Icons.ANALYTICS, ft.Colors.GREEN_500, "Métricas de Arquitetura",
+                                         "Indicadores de qualidade e complexidade"),
                     ft.Divider(),
                     ft.Container(
                         content=self.grid_metricas,
@@ -43,61 +83,51 @@ class MetricasCard:
     
     def atualizar_metricas(self, metricas):
         """Atualiza o grid de métricas"""
-        self.grid_metricas.controls.clear()
-        
         if not metricas:
-            self.grid_metricas.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(ft.Icons.WARNING, size=30, color=ft.Colors.ORANGE),
-                        ft.Text("Nenhuma métrica", size=14, weight=ft.FontWeight.BOLD),
-                        ft.Text("Execute a análise", size=12, color=ft.Colors.GREY_600)
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=15,
-                    alignment=ft.alignment.center
-                )
-            )
+            self._ultimos_valores = None
+            self.grid_metricas.controls = [self._estado_vazio]
+            if self.page and not self._suprimir_atualizacao:
+                atualizar_controles(self.page, self.grid_metricas)
             return
         
-        metricas_display = [
-            ("Acoplamento", f"{getattr(metricas, 'acoplamento_medio', 0):.2f}", ft.Icons.LINK, 
-             self._get_cor_metrica(getattr(metricas, 'acoplamento_medio', 0), 0.3, 0.7)),
-            
-            ("Coesão", f"{getattr(metricas, 'coesao_media', 0):.2f}", ft.Icons.GROUP_WORK,
-             self._get_cor_metrica(getattr(metricas, 'coesao_media', 0), 0.6, 0.8, invertido=True)),
-            
-            ("Modularidade", f"{getattr(metricas, 'modularidade', 0):.3f}", ft.Icons.VIEW_MODULE,
-             self._get_cor_metrica(getattr(metricas, 'modularidade', 0), 0.3, 0.6)),
-            
-            ("Densidade", f"{getattr(metricas, 'densidade', 0):.3f}", ft.Icons.DENSITY_MEDIUM,
-             self._get_cor_metrica(getattr(metricas, 'densidade', 0), 0.1, 0.3)),
-            
-            ("Complexidade", f"{getattr(metricas, 'complexidade_ciclomatica_media', 0):.1f}", ft.Icons.CODE,
-             self._get_cor_metrica(getattr(metricas, 'complexidade_ciclomatica_media', 0), 10, 20, invertido=True)),
-            
-            ("Componentes", str(getattr(metricas, 'numero_componentes', 0)), ft.Icons.ACCOUNT_TREE,
-             ft.Colors.BLUE_400),
-        ]
+        # Lê cada atributo uma única vez; sem mudança nos valores não há o que redesenhar
+        valores = tuple(getattr(metricas, spec[0], 0) for spec in _METRICAS_EXIBIDAS)
+        if valores == self._ultimos_valores:
+            return
+        self._ultimos_valores = valores
+        
+        # Atualiza os tiles existentes
+        for (container, icone, texto_valor), (_, _, formato, _, bom, otimo, invertido), valor in zip(
+                self._tiles, _METRICAS_EXIBIDAS, valores):
+            cor = ft.Colors.BLUE_400 if bom is None else self._get_cor_metrica(valor, bom, otimo, invertido)
+            texto_valor.value = formato.format(valor)
+            icone.color = cor
+            container.bgcolor = self._get_cor_fundo(cor)
+            container.border = ft.border.all(2, cor)
         
-        for nome, valor, icone, cor in metricas_display:
-            self.grid_metricas.controls.append(
-                ft.Container(
-                    content=ft.Column([
-                        ft.Icon(icone, size=30, color=cor),
-                        ft.Text(valor, size=18, weight=ft.FontWeight.BOLD),
-                        ft.Text(nome, size=12, text_align=ft.TextAlign.CENTER)
-                    ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
-                    padding=15,
-                    border_radius=8,
-                    bgcolor=self._get_cor_fundo(cor),
-                    border=ft.border.all(2, cor)
-                )
-            )
+        self.grid_metricas.controls = [container for container, _, _ in self._tiles]
         
-        if self.page:
-            self.page.update()
+        if self.page and not self._suprimir_atualizacao:
+            atualizar_controles(self.page, self.grid_metricas)
+    
+    def _criar_tile_metrica(self, nome: str, icone: str):
+        """Cria o tile de uma métrica; retorna (container, ícone, texto do valor)"""
+        icone_tile = ft.Icon(icone, size=30)
+        texto_valor = ft.Text("", size=18, weight=ft.FontWeight.BOLD)
+        container = ft.Container(
+            content=ft.Column([
+                icone_tile,
+                texto_valor,
+                ft.Text(nome, size=12, text_align=ft.TextAlign.CENTER)
+            ], horizontal_alignment=ft.CrossAxisAlignment.CENTER),
+            padding=15,
+            border_radius=8
+        )
+        return container, icone_tile, texto_valor
     
-    def _get_cor_metrica(self, valor: float, bom: float, otimo: float, invertido: bool = False) -> str:
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _get_cor_metrica(valor: float, bom: float, otimo: float, invertido: bool = False) -> str:
         """Retorna cor baseada no valor da métrica"""
         if invertido:
             if valor <= bom: return ft.Colors.GREEN
@@ -108,15 +138,10 @@ class MetricasCard:
             elif valor >= bom: return ft.Colors.ORANGE  
             else: return ft.Colors.RED
     
-    def _get_cor_fundo(self, cor: str) -> str:
+    @staticmethod
+    def _get_cor_fundo(cor: str) -> str:
         """Retorna cor de fundo suave baseada na cor principal"""
-        cores_fundo = {
-            ft.Colors.GREEN: ft.Colors.GREEN_50,
-            ft.Colors.ORANGE: ft.Colors.ORANGE_50, 
-            ft.Colors.RED: ft.Colors.RED_50,
-            ft.Colors.BLUE_400: ft.Colors.BLUE_50
-        }
-        return cores_fundo.get(cor, ft.Colors.GREY_50)
+        return _CORES_FUNDO.get(cor, ft.Colors.GREY_50)
     
     def set_page(self, page: ft.Page):
         """Define a página para atualizações"""
@@ -2,24 +2,35 @@
 
 import flet as ft
 from typing import Dict, List
+from .cabecalho_card import criar_cabecalho_card
+from .atualizacao import atualizar_controles
+
+# Quantidade máxima de nós exibidos (top N)
+_MAX_NOS_EXIBIDOS = 5
 
 class NosCriticosCard:
+    __slots__ = ('controller', 'notifier', 'page', 'lista_nos_criticos', '_itens_nos', '_ultima_assinatura', '_estado_vazio', '_suprimir_atualizacao')
+    
     def __init__(self, controller, notifier):
         self.controller = controller
         self.notifier = notifier
         self.page = None
+        # Ligado pelo ViewManager durante a atualização em lote (um único page.update() ao final)
+        self._suprimir_atualizacao = False
         
     def build(self) -> ft.Card:
+        # Itens criados uma vez; atualizar_nos_criticos só altera textos, cores e visibilidade
+        self._itens_nos = [self._criar_item_no() for _ in range(_MAX_NOS_EXIBIDOS)]
+        # Nós exibidos na última atualização (None = lista ainda não preenchida)
+        self._ultima_assinatura = None
+        self._estado_vazio = ft.Text("Nenhum nó crítico identificado", color=ft.Colors.GREY_600)
         self.lista_nos_criticos = ft.Column(scroll=ft.ScrollMode.ADAPTIVE)
         
         return ft.Card(
             content=ft.Container(
                 content=ft.Column([
-                    ft.ListTile(
-                        leading=ft.Icon(ft.Icons.WARNING, color=ft.Colors.RED_500),
-                        title=ft.Text("Nós Críticos", weight=ft.FontWeight.BOLD),
-                        subtitle=ft.Text("Componentes com alta centralidade")
-                    ),
+                    criar_cabecalho_card(ft.Icons.WARNING, ft.Colors.RED_500, "Nós Críticos",
+                                         "Componentes com alta centralidade"),
                     ft.Divider(),
                     ft.Container(
                         content=self.lista_nos_criticos,
@@ -33,33 +44,45 @@ class NosCriticosCard:
     
     def atualizar_nos_criticos(self, nos_criticos: List[Dict]):
         """Atualiza a lista de nós críticos"""
-        self.lista_nos_criticos.controls.clear()
-        
         if not nos_criticos:
-            self.lista_nos_criticos.controls.append(
-                ft.Text("Nenhum nó crítico identificado", color=ft.Colors.GREY_600)
-            )
+            self._ultima_assinatura = None
+            self.lista_nos_criticos.controls = [self._estado_vazio]
+            if self.page and not self._suprimir_atualizacao:
+                atualizar_controles(self.page, self.lista_nos_criticos)
             return
             
-        for no in nos_criticos[:5]:  # Mostra apenas top 5
-            self.lista_nos_criticos.controls.append(
-                ft.ListTile(
-                    title=ft.Text(no.get('node_id', 'Unknown'), size=14),
-                    subtitle=ft.Text(
-                        f"Intermediação: {no.get('centralidade_intermediacao', 0):.3f} | "
-                        f"Tipo: {no.get('tipo', 'Unknown')}",
-                        size=12
-                    ),
-                    leading=ft.Icon(
-                        ft.Icons.CIRCLE,
-                        color=ft.Colors.RED if no.get('centralidade_intermediacao', 0) > 0.3 
-                        else ft.Colors.ORANGE
-                    )
-                )
-            )
+        # Mostra apenas top 5, reaproveitando os itens existentes
+        nos_exibidos = nos_criticos[:_MAX_NOS_EXIBIDOS]
+        assinatura = tuple(
+            (no.get('node_id'), no.get('centralidade_intermediacao'), no.get('tipo'))
+            for no in nos_exibidos
+        )
+        if assinatura == self._ultima_assinatura:
+            return
+        self._ultima_assinatura = assinatura
+        
+        for i, item in enumerate(self._itens_nos):
+            item.visible = i < len(nos_exibidos)
+            if item.visible:
+                no = nos_exibidos[i]
+                centralidade = no.get('centralidade_intermediacao', 0)
+                item.title.value = no.get('node_id', 'Unknown')
+                item.subtitle.value = f"Intermediação: {centralidade:.3f} | Tipo: {no.get('tipo', 'Unknown')}"
+                item.leading.color = ft.Colors.RED if centralidade > 0.3 else ft.Colors.ORANGE
+        
+        self.lista_nos_criticos.controls = self._itens_nos
         
-        if self.page:
-            self.page.update()
+        if self.page and not self._suprimir_atualizacao:
+            atualizar_controles(self.page, self.lista_nos_criticos)
+    
+    def _criar_item_no(self) -> ft.ListTile:
+        """Cria um item vazio da lista de nós críticos"""
+        return ft.ListTile(
+            title=ft.Text("", size=14),
+            subtitle=ft.Text("", size=12),
+            leading=ft.Icon(ft.Icons.CIRCLE),
+            visible=False
+        )
     
     def set_page(self, page: ft.Page):
         """Define a página para atualizações"""
@@ -1,27 +1,123 @@
 import flet as ft
 import logging
+import os
 import time
-import threading
 import json
 import asyncio
+import threading
+import functools
+from contextlib import contextmanager
 from typing import Dict, Any, List, Optional
 from datetime import datetime
+from .debouncer import Debouncer
+from .atualizacao import atualizar_controles
+from ...controller import LIMITE_PROMPT_RAG
 
 logger = logging.getLogger(__name__)
 
+# Espera (s) após a última tecla antes de recompor o prompt completo
+_ESPERA_DIGITACAO = 0.15
+
+# Intervalo mínimo (s) entre atualizações da página durante o streaming da resposta
+_INTERVALO_STREAM = 0.05
+
+# Blocos do contexto descartados, nesta ordem, quando o prompt excede o limite
+_BLOCOS_DESCARTAVEIS = ("=== ANÁLISE CONTEXTUAL ===", "=== MÉTRICAS DE QUALIDADE ARQUITETURAL ===")
+
+_SUFIXO_PROMPT = "\n\nRESPOSTA:"
+_MARCADOR_PERGUNTA = "PERGUNTA DO USUÁRIO:"
+_MARCADOR_RESPOSTA = "RESPOSTA:"
+
+# Pasta onde as análises salvas são gravadas
+_PASTA_EXPORTACAO = "storage/export"
+
+# Quantidade de análises exibidas no histórico do card
+_LIMITE_HISTORICO_RAG = 8
+_ICONE_HISTORICO = ft.Icons.AUTO_AWESOME_MOSAIC
+_COR_ICONE_HISTORICO = ft.Colors.BLUE_400
+
+# Trechos fixos do contexto de estatísticas: abertura (antes das estatísticas gerais) e instrução final
+_CONTEXTO_PREFIXO = "CONTEXTO DA ANÁLISE DE ARQUITETURA:\n\n=== ESTATÍSTICAS GERAIS DO SISTEMA ===\n"
+_CONTEXTO_SUFIXO = (
+    "INSTRUÇÃO: Com base nestas métricas, analise a arquitetura do sistema considerando:\n"
+    "1. Qualidade arquitetural (acoplamento, coesão, modularidade)\n"
+    "2. Complexidade e manutenibilidade\n"
+    "3. Pontos críticos e gargalos\n"
+    "4. Recomendações de melhoria específicas\n"
+    "5. Padrões arquiteturais aplicáveis\n\n"
+    "PERGUNTA DO USUÁRIO:\n"
+)
+
+# Pergunta carregada pelo botão "Exemplo"
+_PROMPT_EXEMPLO = """Com base nas métricas fornecidas, analise a qualidade geral da arquitetura e identifique:
+
+1. Os 3 principais pontos fortes
+2. Os 3 principais problemas 
+3. Sugestões específicas de refatoração
+4. Recomendações para melhorar a manutenibilidade
+
+Forneça a análise em formato de relatório técnico."""
+
+# Texto exibido pelo botão de informações do card
+_TEXTO_INFO = """
+🤖 **RAG Analyser**
+
+Este componente combina Retrieval-Augmented Generation (RAG) com análise de arquitetura:
+
+**Como funciona:**
+1. Carrega métricas da análise arquitetural
+2. Combina com sua pergunta em um prompt contextualizado  
+3. Envia para um modelo de LLM (Ollama)
+4. Retorna análise específica baseada no contexto
+
+**Contexto incluído:**
+• Estatísticas do sistema (componentes, dependências)
+• Métricas de qualidade (acoplamento, coesão, modularidade)
+• Análise contextual e pontos de atenção
+
+**Use para:**
+• Análises técnicas detalhadas
+• Sugestões de refatoração
+• Identificação de problemas
+• Recomendações de melhorias
+"""
+
 class RagAnalyserCard:
     def __init__(self, controller, notifier):
         self.controller = controller
         self.notifier = notifier
         self.analises_historico = []
+        # Itens do histórico já montados, por (id, timestamp) da análise
+        self._itens_historico = {}
+        # Versão do histórico exibida (None = ainda não carregado)
+        self._versao_historico = None
         self.estatisticas_contexto = ""
-        self.analise_thread = None
+        # Tarefa da análise em andamento no event loop da página
+        self._analise_future = None
+        # Execução cujo streaming está sendo exibido (incrementado ao iniciar/encerrar)
+        self._execucao_stream = 0
+        # Card encerrado (fechado ou página desconectada): não envia mais atualizações
+        self._encerrado = False
+        self._ultima_atualizacao_stream = 0.0
+        # Blocos de atualização agrupada abertos e se há page.update() adiado
+        self._profundidade_atualizacao = 0
+        self._atualizacao_pendente = False
         self.analise_em_andamento = False
         self.page = None
+        # Último (valor, mensagem) enviado à barra de progresso
+        self._ultimo_progresso = None
+        # (chave da análise, contexto) do último contexto construído
+        self._contexto_cache = (None, "")
+        self._debouncer_prompt = Debouncer(_ESPERA_DIGITACAO)
+        # Card já construído; reconstruções reaproveitam a mesma árvore de controles
+        self._card = None
         
     def build(self) -> ft.Card:
         """Constrói o card completo do RAG Analyser"""
-        return ft.Card(
+        if self._card is not None:
+            return self._card
+        
+        self._card = ft.Card(
             content=ft.Container(
                 content=ft.Column([
                     self._build_header(),
@@ -41,6 +137,10 @@ class RagAnalyserCard:
             width=900,
             margin=10
         )
+        # Com a página já definida, a carga inicial aguardava os controles existirem
+        if self.page:
+            self._iniciar_carga_inicial()
+        return self._card
     
     def _build_header(self) -> ft.Container:
         """Cabeçalho do card"""
@@ -130,7 +230,7 @@ class RagAnalyserCard:
             max_lines=4,
             hint_text="Ex: Analise o acoplamento do sistema e sugira melhorias...\nEx: Quais são os pontos críticos da arquitetura?\nEx: Como melhorar a modularidade?",
             expand=True,
-            on_change=self._atualizar_prompt_completo,
+            on_change=self._agendar_atualizacao_prompt,
             border_color=ft.Colors.BLUE_300,
             focused_border_color=ft.Colors.BLUE_500
         )
@@ -157,12 +257,19 @@ class RagAnalyserCard:
             multiline=True,
             min_lines=8,
             max_lines=15,
-            hint_text="Aqui você pode ver e editar o prompt completo que será enviado para a IA...",
+            hint_text="Aqui você pode editar a pergunta que será enviada para a IA junto com o contexto...",
             expand=True,
             border_color=ft.Colors.PURPLE_300,
             focused_border_color=ft.Colors.PURPLE_500
         )
         
+        # Resumo do contexto; o texto completo só é anexado ao prompt no envio
+        self.preview_contexto = ft.Text(
+            "Contexto não carregado",
+            size=12,
+            color=ft.Colors.GREY_600
+        )
+        
         return ft.Container(
             content=ft.Column([
                 ft.Row([
@@ -174,14 +281,12 @@ class RagAnalyserCard:
                         icon=ft.Icons.INFO_OUTLINE,
                         icon_size=16,
                         icon_color=ft.Colors.PURPLE_500,
-                        tooltip="""Este é o prompt completo que será enviado para a IA. 
-Inclui o contexto das métricas + sua pergunta.
+                        tooltip="""Este é o prompt que será enviado para a IA. 
+O contexto das métricas é anexado antes da sua pergunta no envio.
 Você pode editá-lo livremente para refinar a análise.""",
                     )
                 ]),
-                ft.Text("Contexto + Sua pergunta (editável):",
-                       size=12,
-                       color=ft.Colors.GREY_600),
+                self.preview_contexto,
                 ft.Container(height=5),
                 self.prompt_completo_field,
                 ft.Container(height=5),
@@ -223,6 +328,14 @@ Você pode editá-lo livremente para refinar a análise.""",
             )
         )
         
+        # Botão de cancelamento (visível apenas durante a análise)
+        self.btn_cancelar = ft.OutlinedButton(
+            "Cancelar",
+            icon=ft.Icons.STOP,
+            on_click=self._cancelar_analise,
+            visible=False
+        )
+        
         # Barra de progresso
         self.progress_bar = ft.ProgressBar(
             value=0,
@@ -251,6 +364,7 @@ Você pode editá-lo livremente para refinar a análise.""",
             content=ft.Column([
                 ft.Row([
                     self.btn_analisar,
+                    self.btn_cancelar,
                     ft.VerticalDivider(width=20),
                     ft.Column([
                         self.progress_bar,
@@ -279,6 +393,70 @@ Você pode editá-lo livremente para refinar a análise.""",
             spacing=10
         )
         
+        # Controles do resultado, criados uma vez e preenchidos em _exibir_resultado
+        self._resultado_atual = ("", "", None)
+        self._resultado_modelo = ft.Text("", size=12, color=ft.Colors.GREY_600, italic=True)
+        self._resultado_contexto = ft.Text("", size=11, color=ft.Colors.GREY_600, selectable=True)
+        self._md_resultado = ft.Markdown(
+            "",
+            selectable=True,
+            extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
+            code_theme="atom-one-dark",
+            on_tap_link=self._abrir_link
+        )
+        self._controles_resultado = [
+            # Cabeçalho do resultado
+            ft.Row([
+                ft.Icon(ft.Icons.INSIGHTS, color=ft.Colors.GREEN_500, size=24),
+                ft.Text("Análise Gerada com IA", 
+                       size=18, 
+                       weight=ft.FontWeight.BOLD,
+                       color=ft.Colors.GREEN_700)
+            ]),
+            self._resultado_modelo,
+            ft.Divider(),
+            ft.Text("Contexto utilizado:", size=12, weight=ft.FontWeight.BOLD),
+            ft.Container(
+                content=self._resultado_contexto,
+                padding=10,
+                bgcolor=ft.Colors.GREY_100,
+                border_radius=5
+            ),
+            ft.Divider(),
+            # Área de análise
+            self._md_resultado,
+            # Botões de ação
+            ft.Row([
+                ft.ElevatedButton(
+                    "📋 Copiar Análise",
+                    icon=ft.Icons.CONTENT_COPY,
+                    on_click=self._copiar_resultado,
+                    style=ft.ButtonStyle(
+                        color=ft.Colors.WHITE,
+                        bgcolor=ft.Colors.BLUE_600
+                    )
+                ),
+                ft.ElevatedButton(
+                    "💾 Salvar", 
+                    icon=ft.Icons.SAVE,
+                    on_click=self._salvar_resultado,
+                    style=ft.ButtonStyle(
+                        color=ft.Colors.WHITE,
+                        bgcolor=ft.Colors.GREEN_600
+                    )
+                ),
+                ft.ElevatedButton(
+                    "🔄 Nova Análise", 
+                    icon=ft.Icons.CLEAR,
+                    on_click=self._limpar_resultado,
+                    style=ft.ButtonStyle(
+                        color=ft.Colors.WHITE,
+                        bgcolor=ft.Colors.ORANGE_600
+                    )
+                )
+            ])
+        ]
+        
         return ft.Container(
             content=ft.Column([
                 ft.Row([
@@ -313,6 +491,11 @@ Você pode editá-lo livremente para refinar a análise.""",
             padding=10,
             height=200
         )
+        self._historico_vazio = ft.ListTile(
+            title=ft.Text("Nenhuma análise no histórico"),
+            subtitle=ft.Text("As análises geradas aparecerão aqui"),
+            leading=ft.Icon(ft.Icons.HISTORY, color=ft.Colors.GREY_400),
+        )
         
         return ft.Container(
             content=ft.Column([
@@ -343,59 +526,61 @@ Você pode editá-lo livremente para refinar a análise.""",
     
     def _carregar_estatisticas(self, e):
         """Carrega as estatísticas atuais para usar como contexto"""
-        try:
-            # ✅ CORREÇÃO: Obter análise atual do controller
-            analise_atual = self.controller.get_analise_atual()
+        # Estado de carregamento e resultado chegam à página em um único envio
+        with self._atualizacao_agrupada():
+            try:
+                # ✅ CORREÇÃO: Obter análise atual do controller
+                analise_atual = self.controller.get_analise_atual()
             
-            if not analise_atual:
-                self.notifier.warning("Nenhuma análise disponível. Execute a análise completa primeiro!")
-                self._reset_stats_ui()
-                return
+                if not analise_atual:
+                    self.notifier.warning("Nenhuma análise disponível. Execute a análise completa primeiro!")
+                    self._reset_stats_ui()
+                    return
                 
-            # Desabilita o botão durante o carregamento
-            self.btn_carregar_stats.disabled = True
-            self.btn_carregar_stats.text = "⏳ Carregando..."
-            if self.page:
-                self.page.update()
-
-            # Obtém métricas e estatísticas da análise atual
-            metricas = analise_atual.get('metricas_avancadas', {})
-            estatisticas = analise_atual.get('resultado_grafo', {}).get('estatisticas', {})
-            storytelling = analise_atual.get('storytelling', {})
+                # Obtém métricas e estatísticas da análise atual
+                metricas = analise_atual.get('metricas_avancadas', {})
+                estatisticas = analise_atual.get('resultado_grafo', {}).get('estatisticas', {})
+                storytelling = analise_atual.get('storytelling', {})
 
-            # Verifica se temos dados suficientes
-            if not estatisticas or estatisticas.get('num_nos', 0) == 0:
-                self.notifier.warning("Dados de análise insuficientes ou vazios")
-                self._reset_stats_ui()
-                return
+                # Verifica se temos dados suficientes
+                if not estatisticas or estatisticas.get('num_nos', 0) == 0:
+                    self.notifier.warning("Dados de análise insuficientes ou vazios")
+                    self._reset_stats_ui()
+                    return
 
-            # Constrói o contexto com as estatísticas
-            contexto = self._construir_contexto_estatisticas(metricas, estatisticas, storytelling)
-            self.estatisticas_contexto = contexto
+                # Constrói o contexto com as estatísticas (reaproveita se a análise não mudou)
+                chave = (id(analise_atual), estatisticas.get('num_nos'), estatisticas.get('num_arestas'),
+                         estatisticas.get('num_comunidades'))
+                chave_cache, contexto = self._contexto_cache
+                if chave != chave_cache:
+                    contexto = self._construir_contexto_estatisticas(metricas, estatisticas, storytelling)
+                    self._contexto_cache = (chave, contexto)
+                self.estatisticas_contexto = contexto
+                num_linhas = contexto.count("\n")
+                self.preview_contexto.value = f"Contexto: {num_linhas} linhas, {len(contexto)} caracteres"
 
-            # Atualiza a UI
-            self.stats_status.value = f"✅ {estatisticas.get('num_nos', 0)} componentes carregados"
-            self.stats_status.color = ft.Colors.GREEN_600
+                # Atualiza a UI
+                self.stats_status.value = f"✅ {estatisticas.get('num_nos', 0)} componentes carregados"
+                self.stats_status.color = ft.Colors.GREEN_600
 
-            # Atualiza indicador de métricas
-            self.metrics_indicator.visible = True
-            self.metrics_indicator.content.controls[1].value = f"{estatisticas.get('num_nos', 0)} componentes"
-            self.metrics_indicator.content.controls[0].color = ft.Colors.GREEN
+                # Atualiza indicador de métricas
+                self.metrics_indicator.visible = True
+                self.metrics_indicator.content.controls[1].value = f"{estatisticas.get('num_nos', 0)} componentes"
+                self.metrics_indicator.content.controls[0].color = ft.Colors.GREEN
 
-            # Atualiza o prompt completo com o contexto
-            self._atualizar_prompt_completo()
+                # Atualiza o prompt completo com o contexto
+                self._atualizar_prompt_completo()
 
-            self.notifier.success("Estatísticas carregadas com sucesso!")
+                self.notifier.success("Estatísticas carregadas com sucesso!")
 
-        except Exception as ex:
-            logger.error(f"Erro ao carregar estatísticas: {ex}")
-            self.notifier.error(f"Erro ao carregar estatísticas: {str(ex)}")
-            self._reset_stats_ui()
-        finally:
-            self.btn_carregar_stats.disabled = False
-            self.btn_carregar_stats.text = "📊 Carregar Estatísticas"
-            if self.page:
-                self.page.update()
+            except Exception as ex:
+                logger.error(f"Erro ao carregar estatísticas: {ex}")
+                self.notifier.error(f"Erro ao carregar estatísticas: {str(ex)}")
+                self._reset_stats_ui()
+            finally:
+                self.btn_carregar_stats.disabled = False
+                self.btn_carregar_stats.text = "📊 Carregar Estatísticas"
+                self._atualizar_pagina()
     
     def _reset_stats_ui(self):
         """Reseta a UI das estatísticas"""
@@ -407,76 +592,81 @@ Você pode editá-lo livremente para refinar a análise.""",
     
     def _construir_contexto_estatisticas(self, metricas, estatisticas, storytelling) -> str:
         """Constrói o contexto com as estatísticas formatadas"""
-        contexto = "CONTEXTO DA ANÁLISE DE ARQUITETURA:\n\n"
-        
-        # Estatísticas básicas
-        contexto += "=== ESTATÍSTICAS GERAIS DO SISTEMA ===\n"
-        contexto += f"• Total de componentes (nós): {estatisticas.get('num_nos', 'N/A')}\n"
-        contexto += f"• Total de dependências (arestas): {estatisticas.get('num_arestas', 'N/A')}\n"
-        contexto += f"• Comunidades detectadas: {estatisticas.get('num_comunidades', 'N/A')}\n"
-        contexto += f"• Componentes isolados: {estatisticas.get('nos_isolados', 'N/A')}\n"
-        contexto += f"• Densidade do grafo: {estatisticas.get('densidade', 'N/A')}\n"
-        contexto += f"• Grau médio (conexões por componente): {estatisticas.get('grau_medio', 'N/A')}\n\n"
+        g = estatisticas.get
+        partes = [
+            _CONTEXTO_PREFIXO,
+            f"• Total de componentes (nós): {g('num_nos', 'N/A')}\n",
+            f"• Total de dependências (arestas): {g('num_arestas', 'N/A')}\n",
+            f"• Comunidades detectadas: {g('num_comunidades', 'N/A')}\n",
+            f"• Componentes isolados: {g('nos_isolados', 'N/A')}\n",
+            f"• Densidade do grafo: {g('densidade', 'N/A')}\n",
+            f"• Grau médio (conexões por componente): {g('grau_medio', 'N/A')}\n\n",
+        ]
+        adicionar = partes.append
         
         # Métricas avançadas
         if hasattr(metricas, 'acoplamento_medio'):
-            contexto += "=== MÉTRICAS DE QUALIDADE ARQUITETURAL ===\n"
-            contexto += f"• Acoplamento médio: {metricas.acoplamento_medio:.3f} (0-1, menor é melhor)\n"
-            contexto += f"• Coesão média: {getattr(metricas, 'coesao_media', 0):.3f} (0-1, maior é melhor)\n"
-            contexto += f"• Modularidade: {getattr(metricas, 'modularidade', 0):.3f} (0-1, maior é melhor)\n"
-            contexto += f"• Densidade: {getattr(metricas, 'densidade', 0):.3f} (0-1)\n"
+            coesao = getattr(metricas, 'coesao_media', 0)
+            modularidade = getattr(metricas, 'modularidade', 0)
+            densidade = getattr(metricas, 'densidade', 0)
+            adicionar("=== MÉTRICAS DE QUALIDADE ARQUITETURAL ===\n")
+            adicionar(f"• Acoplamento médio: {metricas.acoplamento_medio:.3f} (0-1, menor é melhor)\n")
+            adicionar(f"• Coesão média: {coesao:.3f} (0-1, maior é melhor)\n")
+            adicionar(f"• Modularidade: {modularidade:.3f} (0-1, maior é melhor)\n")
+            adicionar(f"• Densidade: {densidade:.3f} (0-1)\n")
             if hasattr(metricas, 'complexidade_ciclomatica_media'):
-                contexto += f"• Complexidade ciclomática média: {metricas.complexidade_ciclomatica_media:.1f}\n"
+                adicionar(f"• Complexidade ciclomática média: {metricas.complexidade_ciclomatica_media:.1f}\n")
             if hasattr(metricas, 'centralidade_intermediacao_maxima'):
-                contexto += f"• Centralidade máxima (intermediação): {metricas.centralidade_intermediacao_maxima:.3f}\n"
-            contexto += f"• Componentes conectados: {getattr(metricas, 'numero_componentes', 0)}\n\n"
+                adicionar(f"• Centralidade máxima (intermediação): {metricas.centralidade_intermediacao_maxima:.3f}\n")
+            adicionar(f"• Componentes conectados: {getattr(metricas, 'numero_componentes', 0)}\n\n")
         
         # Insights do storytelling
         if storytelling:
-            contexto += "=== ANÁLISE CONTEXTUAL ===\n"
-            contexto += f"Resumo: {storytelling.get('resumo_geral', 'N/A')}\n"
-            contexto += f"Insights técnicos: {storytelling.get('insights_tecnicos', 'N/A')}\n"
-            contexto += f"Pontos de atenção: {storytelling.get('pontos_atencao', 'N/A')}\n"
-            contexto += f"Recomendações: {storytelling.get('recomendacoes', 'N/A')}\n\n"
+            h = storytelling.get
+            adicionar("=== ANÁLISE CONTEXTUAL ===\n")
+            adicionar(f"Resumo: {h('resumo_geral', 'N/A')}\n")
+            adicionar(f"Insights técnicos: {h('insights_tecnicos', 'N/A')}\n")
+            adicionar(f"Pontos de atenção: {h('pontos_atencao', 'N/A')}\n")
+            adicionar(f"Recomendações: {h('recomendacoes', 'N/A')}\n\n")
         
-        contexto += "INSTRUÇÃO: Com base nestas métricas, analise a arquitetura do sistema considerando:\n"
-        contexto += "1. Qualidade arquitetural (acoplamento, coesão, modularidade)\n"
-        contexto += "2. Complexidade e manutenibilidade\n"
-        contexto += "3. Pontos críticos e gargalos\n"
-        contexto += "4. Recomendações de melhoria específicas\n"
-        contexto += "5. Padrões arquiteturais aplicáveis\n\n"
+        adicionar(_CONTEXTO_SUFIXO)
         
-        contexto += "PERGUNTA DO USUÁRIO:\n"
-        
-        return contexto
+        return "".join(partes)
+    
+    def _agendar_atualizacao_prompt(self, e=None):
+        """Recompõe o prompt completo apenas após uma pausa na digitação"""
+        self._debouncer_prompt.agendar(self._atualizar_prompt_completo)
     
     def _atualizar_prompt_completo(self, e=None):
         """Atualiza o prompt completo combinando contexto e pergunta do usuário"""
+        # O campo guarda só a pergunta; o contexto é anexado em _gerar_analise
         pergunta_usuario = self.prompt_simples_field.value.strip()
         
-        if not self.estatisticas_contexto:
-            # Se não há estatísticas carregadas, mostra apenas a pergunta
-            self.prompt_completo_field.value = pergunta_usuario
-        else:
-            # Combina contexto + pergunta do usuário
-            prompt_completo = f"{self.estatisticas_contexto}{pergunta_usuario}\n\nRESPOSTA:"
-            self.prompt_completo_field.value = prompt_completo
+        # Pergunta inalterada: evita reenviar a página
+        if pergunta_usuario == self.prompt_completo_field.value:
+            return
+        self.prompt_completo_field.value = pergunta_usuario
         
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.prompt_completo_field)
     
     def _gerar_analise(self, e):
         """Gera análise baseada no prompt completo"""
+        if not self.page:
+            return
+        
         if not self.estatisticas_contexto:
             self.notifier.warning("Carregue as estatísticas primeiro!")
             return
             
-        prompt_completo = self.prompt_completo_field.value.strip()
+        pergunta = (self.prompt_completo_field.value or "").strip()
         
-        if not prompt_completo:
+        if not pergunta:
             self.notifier.warning("O prompt completo está vazio!")
             return
         
+        # Combina contexto + pergunta do usuário apenas no envio
+        prompt_completo = self._montar_prompt(pergunta)
+        
         # Valida o prompt (se o método existir no controller)
         if hasattr(self.controller, 'validar_prompt_rag'):
             validacao = self.controller.validar_prompt_rag(prompt_completo)
@@ -492,91 +682,150 @@ Você pode editá-lo livremente para refinar a análise.""",
         # Inicia a análise
         self._iniciar_analise()
         
-        # Executa em thread separada para não travar a UI
-        self.analise_thread = threading.Thread(
-            target=self._executar_analise_llm,
-            args=(prompt_completo,),
-            daemon=True
-        )
-        self.analise_thread.start()
+        # Executa no event loop da página; a chamada HTTP ao LLM não bloqueia a UI
+        self._analise_future = self.page.run_task(self._executar_analise_async, prompt_completo)
+        self._analise_future.add_done_callback(self._ao_concluir_analise)
     
-    def _executar_analise_llm(self, prompt_completo: str):
-        """Executa a análise LLM em uma thread separada"""
+    def _montar_prompt(self, pergunta: str) -> str:
+        """Combina contexto e pergunta, reduzindo o prompt para caber em LIMITE_PROMPT_RAG"""
+        contexto = self.estatisticas_contexto
+        tamanho_original = len(contexto) + len(pergunta) + len(_SUFIXO_PROMPT)
+        if tamanho_original <= LIMITE_PROMPT_RAG:
+            return f"{contexto}{pergunta}{_SUFIXO_PROMPT}"
+        
+        # Descarta primeiro os blocos mais volumosos e menos essenciais do contexto
+        for marcador in _BLOCOS_DESCARTAVEIS:
+            if len(contexto) + len(pergunta) + len(_SUFIXO_PROMPT) <= LIMITE_PROMPT_RAG:
+                break
+            inicio = contexto.find(marcador)
+            if inicio < 0:
+                continue
+            # O bloco vai até o próximo cabeçalho de seção ou até a instrução final
+            fins = [pos for pos in (contexto.find("\n=== ", inicio) + 1, contexto.find("INSTRUÇÃO:", inicio))
+                    if pos > 0]
+            fim = min(fins) if fins else len(contexto)
+            contexto = contexto[:inicio] + contexto[fim:]
+        
+        # Ainda acima do limite: corta o final da pergunta
+        excesso = len(contexto) + len(pergunta) + len(_SUFIXO_PROMPT) - LIMITE_PROMPT_RAG
+        if excesso > 0:
+            pergunta = pergunta[:max(len(pergunta) - excesso, 0)]
+        
+        prompt = f"{contexto}{pergunta}{_SUFIXO_PROMPT}"
+        self.notifier.warning(f"Prompt truncado de {tamanho_original} para {len(prompt)} caracteres")
+        return prompt
+    
+    def _cancelar_analise(self, e=None):
+        """Cancela a análise em andamento; uma resposta que ainda chegue é descartada"""
+        future = self._analise_future
+        if future is None:
+            return
+        # Desvincula antes de cancelar para o callback de conclusão não finalizar de novo
+        self._analise_future = None
+        future.cancel()
+        self._finalizar_analise()
+        self.notifier.info("Análise cancelada")
+    
+    async def _executar_analise_async(self, prompt_completo: str):
+        """Executa a análise LLM no event loop da página"""
         try:
-            # ✅ CORREÇÃO: Use page.update() em vez de page.run_task() para funções síncronas
-            self._atualizar_progresso_sincrono(0.1, "🔍 Conectando com o servidor LLM...")
-            time.sleep(0.5)
-            
-            self._atualizar_progresso_sincrono(0.3, "⚙️ Processando prompt e contexto...")
-            time.sleep(0.7)
+            # O progresso acompanha apenas marcos reais da chamada ao LLM
+            self._atualizar_progresso(0.05, "🔍 Conectando com o servidor LLM...")
+            self._atualizar_progresso(0.1, "🤖 Gerando análise com IA...")
             
-            self._atualizar_progresso_sincrono(0.5, "🤖 Gerando análise com IA...")
+            # Exibe a resposta à medida que o LLM gera os trechos
+            self._execucao_stream += 1
+            self._md_resultado.value = ""
+            self.resultado_area.controls = [self._md_resultado]
             
             # Chama o controller para gerar a análise
-            resultado = self.controller.gerar_analise_personalizada(prompt_completo)
-            
-            self._atualizar_progresso_sincrono(0.8, "📥 Recebendo resposta...")
-            time.sleep(0.5)
+            resultado = await self.controller.gerar_analise_personalizada_async(
+                prompt_completo,
+                on_token=functools.partial(self._receber_trecho, self._execucao_stream)
+            )
+            if self._encerrado:
+                return
             
             if resultado and resultado.get("sucesso"):
-                self._atualizar_progresso_sincrono(1.0, "✅ Análise concluída!")
-                time.sleep(0.5)
-                
-                # Exibe o resultado na UI
-                self._exibir_resultado_sincrono(
-                    resultado["analise"], 
-                    prompt_completo, 
-                    resultado.get("modelo")
-                )
-                self._carregar_historico_sincrono()
-                self._finalizar_analise_sincrono()
+                # Progresso, resultado e histórico vão à página em um único envio
+                with self._atualizacao_agrupada():
+                    self._atualizar_progresso(1.0, "✅ Análise concluída!")
+                    
+                    # Exibe o resultado na UI
+                    self._exibir_resultado(
+                        resultado["analise"], 
+                        prompt_completo, 
+                        resultado.get("modelo")
+                    )
+                    self._carregar_historico()
             else:
+                # Descarta a resposta parcial exibida durante o streaming
+                self._md_resultado.value = ""
+                self.resultado_area.visible = False
+                self._atualizar_pagina(self.resultado_area)
+                
                 erro_msg = resultado.get('erro', 'Erro desconhecido') if resultado else 'Nenhum resultado retornado'
-                self._exibir_erro_sincrono(f"Erro na análise: {erro_msg}")
-                self._finalizar_analise_sincrono()
+                self.notifier.error(f"Erro na análise: {erro_msg}")
                 
         except Exception as ex:
             logger.error(f"Erro ao executar análise LLM: {ex}")
-            self._exibir_erro_sincrono(f"Erro: {str(ex)}")
-            self._finalizar_analise_sincrono()
+            self.notifier.error(f"Erro: {str(ex)}")
+    
+    def _receber_trecho(self, execucao: int, trecho: str):
+        """Acrescenta um trecho da resposta em streaming (chamado fora do event loop)"""
+        # Análise cancelada ou encerrada: descarta o trecho
+        if execucao != self._execucao_stream:
+            return
+        markdown = self._md_resultado
+        primeiro = not markdown.value
+        markdown.value += trecho
+        if primeiro:
+            # Área de resultado passa a aparecer junto com o progresso, em um único envio
+            # (sem _atualizacao_agrupada: os contadores dela não são seguros fora do event loop)
+            self.resultado_area.visible = True
+            self._ultimo_progresso = (0.5, "📥 Recebendo resposta...")
+            self.progress_bar.value, self.progress_text.value = self._ultimo_progresso
+            self._atualizar_pagina(self.resultado_area, self.progress_bar, self.progress_text)
+            return
+        
+        agora = time.monotonic()
+        if agora - self._ultima_atualizacao_stream >= _INTERVALO_STREAM:
+            self._ultima_atualizacao_stream = agora
+            self._atualizar_pagina(markdown)
     
-    #  Métodos síncronos para atualização da UI a partir de threads
-    def _atualizar_progresso_sincrono(self, valor: float, mensagem: str):
-        """Atualiza a barra de progresso de forma síncrona"""
+    def _atualizar_progresso(self, valor: float, mensagem: str):
+        """Atualiza a barra de progresso"""
         if self.page:
+            # Progresso inalterado: evita reenviar a página
+            progresso = (valor, mensagem)
+            if progresso == self._ultimo_progresso:
+                return
+            self._ultimo_progresso = progresso
+            
             #  Atualiza os controles do próprio componente, não da página
             self.progress_bar.value = valor
             self.progress_text.value = mensagem
             self.progress_bar.visible = True
             self.progress_text.visible = True
-            self.page.update()
+            self._atualizar_pagina(self.progress_bar, self.progress_text)
     
-    def _exibir_resultado_sincrono(self, analise: str, prompt: str, modelo: str = None):
-        """Exibe o resultado de forma síncrona"""
-        if self.page:
-            self._exibir_resultado(analise, prompt, modelo)
-    
-    def _exibir_erro_sincrono(self, mensagem: str):
-        """Exibe erro de forma síncrona"""
-        if self.page:
-            self.notifier.error(mensagem)
-    
-    def _finalizar_analise_sincrono(self):
-        """Finaliza a análise de forma síncrona"""
+    def _ao_concluir_analise(self, future):
+        """Callback de conclusão da tarefa de análise: restaura a UI"""
+        # Execução cancelada: a UI já foi restaurada em _cancelar_analise
+        if future is not self._analise_future:
+            return
+        self._analise_future = None
         if self.page:
             self._finalizar_analise()
     
-    def _carregar_historico_sincrono(self):
-        """Carrega histórico de forma síncrona"""
-        if self.page:
-            self._carregar_historico()
-    
     def _iniciar_analise(self):
         """Prepara a UI para início da análise"""
         self.analise_em_andamento = True
+        self._ultimo_progresso = None
         self.btn_analisar.disabled = True
         self.btn_carregar_stats.disabled = True
         self.btn_analisar.text = "⏳ Analisando..."
+        self.btn_cancelar.visible = True
         self.progress_bar.visible = True
         self.progress_text.visible = True
         self.resultado_area.visible = False
@@ -584,122 +833,60 @@ Você pode editá-lo livremente para refinar a análise.""",
         # Limpa resultado anterior
         self.resultado_area.controls.clear()
         
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.btn_analisar, self.btn_carregar_stats, self.btn_cancelar,
+                               self.progress_bar, self.progress_text, self.resultado_area)
     
     def _finalizar_analise(self):
         """Finaliza a análise e restaura a UI"""
         self.analise_em_andamento = False
+        self._execucao_stream += 1
         self.btn_analisar.disabled = False
         self.btn_carregar_stats.disabled = False
         self.btn_analisar.text = "🤖 Gerar Análise com IA"
+        self.btn_cancelar.visible = False
         self.progress_bar.visible = False
         self.progress_text.visible = False
         
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.btn_analisar, self.btn_carregar_stats, self.btn_cancelar,
+                               self.progress_bar, self.progress_text)
     
     def _exibir_resultado(self, analise: str, prompt: str, modelo: str = None):
         """Exibe o resultado da análise"""
-        self.resultado_area.controls.clear()
+        # Os controles do resultado são criados em _build_result_section; aqui só recebem os valores
+        self._resultado_atual = (analise, prompt, modelo)
+        self._resultado_modelo.value = f"Modelo: {modelo}"
+        self._resultado_modelo.visible = bool(modelo)
+        self._resultado_contexto.value = self._resumir_contexto(prompt)
+        self._md_resultado.value = analise
         
-        # Cabeçalho do resultado
-        header_controls = [
-            ft.Row([
-                ft.Icon(ft.Icons.INSIGHTS, color=ft.Colors.GREEN_500, size=24),
-                ft.Text("Análise Gerada com IA", 
-                       size=18, 
-                       weight=ft.FontWeight.BOLD,
-                       color=ft.Colors.GREEN_700)
-            ])
-        ]
-        
-        # Informações do modelo (se disponível)
-        if modelo:
-            header_controls.append(
-                ft.Text(f"Modelo: {modelo}", 
-                       size=12, 
-                       color=ft.Colors.GREY_600,
-                       italic=True)
-            )
-        
-        header_controls.extend([
-            ft.Divider(),
-            ft.Text("Contexto utilizado:", size=12, weight=ft.FontWeight.BOLD),
-            ft.Container(
-                content=ft.Text(
-                    self._resumir_contexto(prompt),
-                    size=11, 
-                    color=ft.Colors.GREY_600,
-                    selectable=True
-                ),
-                padding=10,
-                bgcolor=ft.Colors.GREY_100,
-                border_radius=5
-            ),
-            ft.Divider()
-        ])
-        
-        # Área de análise
-        analysis_controls = [
-            ft.Markdown(
-                analise,
-                selectable=True,
-                extension_set=ft.MarkdownExtensionSet.GITHUB_WEB,
-                code_theme="atom-one-dark",
-                on_tap_link=lambda e: print(f"Link clicado: {e.data}")
-            )
-        ]
-        
-        # Botões de ação
-        action_controls = [
-            ft.Row([
-                ft.ElevatedButton(
-                    "📋 Copiar Análise",
-                    icon=ft.Icons.CONTENT_COPY,
-                    on_click=lambda _: self._copiar_analise(analise),
-                    style=ft.ButtonStyle(
-                        color=ft.Colors.WHITE,
-                        bgcolor=ft.Colors.BLUE_600
-                    )
-                ),
-                ft.ElevatedButton(
-                    "💾 Salvar", 
-                    icon=ft.Icons.SAVE,
-                    on_click=lambda _: self._salvar_analise(analise, prompt, modelo),
-                    style=ft.ButtonStyle(
-                        color=ft.Colors.WHITE,
-                        bgcolor=ft.Colors.GREEN_600
-                    )
-                ),
-                ft.ElevatedButton(
-                    "🔄 Nova Análise", 
-                    icon=ft.Icons.CLEAR,
-                    on_click=self._limpar_resultado,
-                    style=ft.ButtonStyle(
-                        color=ft.Colors.WHITE,
-                        bgcolor=ft.Colors.ORANGE_600
-                    )
-                )
-            ])
-        ]
-        
-        self.resultado_area.controls.extend(header_controls + analysis_controls + action_controls)
+        self.resultado_area.controls[:] = self._controles_resultado
         self.resultado_area.visible = True
         
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.resultado_area)
+    
+    def _copiar_resultado(self, e):
+        """Copia a análise exibida"""
+        self._copiar_analise(self._resultado_atual[0])
+    
+    def _salvar_resultado(self, e):
+        """Salva a análise exibida em arquivo"""
+        self.page.run_task(self._salvar_analise, *self._resultado_atual)
     
     def _resumir_contexto(self, prompt: str) -> str:
         """Resume o contexto para exibição"""
-        linhas = prompt.split('\n')
-        if len(linhas) <= 10:
-            return prompt
+        # Localiza só as quebras de linha necessárias, sem dividir o prompt inteiro
+        fim_primeiras = -1
+        pos = -1
+        for i in range(10):
+            pos = prompt.find('\n', pos + 1)
+            if pos < 0:
+                return prompt  # Até 10 linhas: exibe completo
+            if i == 4:
+                fim_primeiras = pos
         
         # Mostra primeiras 5 linhas e últimas 2 linhas
-        primeiras = '\n'.join(linhas[:5])
-        ultimas = '\n'.join(linhas[-2:])
-        return f"{primeiras}\n...\n{ultimas}"
+        inicio_ultimas = prompt.rfind('\n', 0, prompt.rfind('\n')) + 1
+        return f"{prompt[:fim_primeiras]}\n...\n{prompt[inicio_ultimas:]}"
     
     def _copiar_analise(self, analise: str):
         """Copia a análise para a área de transferência"""
@@ -711,7 +898,7 @@ Você pode editá-lo livremente para refinar a análise.""",
             logger.error(f"Erro ao copiar análise: {ex}")
             self.notifier.error("Erro ao copiar análise")
     
-    def _salvar_analise(self, analise: str, prompt: str, modelo: str):
+    async def _salvar_analise(self, analise: str, prompt: str, modelo: str):
         """Salva a análise em arquivo"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -730,118 +917,142 @@ Modelo: {modelo or 'N/A'}
 Gerado em: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
 """
             
-            # Em uma implementação real, isso salvaria em arquivo
-            # Por enquanto, apenas copia para clipboard
-            self.page.set_clipboard(conteudo)
-            self.notifier.success("Conteúdo preparado para salvar (copiado para clipboard)")
+            # A gravação roda fora do event loop para não travar a UI
+            filepath = os.path.join(_PASTA_EXPORTACAO, filename)
+            await asyncio.to_thread(self._gravar_arquivo, filepath, conteudo)
+            self.notifier.success(f"Análise salva: {filepath}")
             
         except Exception as ex:
             logger.error(f"Erro ao salvar análise: {ex}")
             self.notifier.error("Erro ao salvar análise")
     
+    @staticmethod
+    def _gravar_arquivo(filepath: str, conteudo: str):
+        """Grava o conteúdo em disco, criando a pasta se necessário"""
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        with open(filepath, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+    
     def _limpar_resultado(self, e=None):
         """Limpa o resultado atual"""
         self.resultado_area.visible = False
         self.prompt_simples_field.value = ""
         self.prompt_completo_field.value = ""
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.resultado_area, self.prompt_simples_field, self.prompt_completo_field)
     
     def _limpar_prompt(self, e):
         """Limpa os campos de prompt"""
         self.prompt_simples_field.value = ""
         self.prompt_completo_field.value = ""
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.prompt_simples_field, self.prompt_completo_field)
     
     def _carregar_exemplo(self, e):
         """Carrega um exemplo de prompt"""
-        exemplo = """Com base nas métricas fornecidas, analise a qualidade geral da arquitetura e identifique:
-
-1. Os 3 principais pontos fortes
-2. Os 3 principais problemas 
-3. Sugestões específicas de refatoração
-4. Recomendações para melhorar a manutenibilidade
-
-Forneça a análise em formato de relatório técnico."""
-        
-        self.prompt_simples_field.value = exemplo
+        self.prompt_simples_field.value = _PROMPT_EXEMPLO
         self._atualizar_prompt_completo()
         self.notifier.info("Exemplo de prompt carregado!")
     
     def _carregar_historico(self, e=None):
         """Carrega o histórico de análises"""
         try:
+            # Histórico sem alterações desde a última carga: nada a reler nem redesenhar
+            versao = None
+            if hasattr(self.controller, 'versao_historico_analises'):
+                versao = self.controller.versao_historico_analises()
+                if versao == self._versao_historico:
+                    return
+            
             if hasattr(self.controller, 'obter_historico_analises'):
-                self.analises_historico = self.controller.obter_historico_analises()
+                self.analises_historico = self.controller.obter_historico_analises(limite=_LIMITE_HISTORICO_RAG)
             else:
                 self.analises_historico = []
-                
-            self.historico_list.controls.clear()
+            self._versao_historico = versao
             
             if not self.analises_historico:
-                self.historico_list.controls.append(
-                    ft.ListTile(
-                        title=ft.Text("Nenhuma análise no histórico"),
-                        subtitle=ft.Text("As análises geradas aparecerão aqui"),
-                        leading=ft.Icon(ft.Icons.HISTORY, color=ft.Colors.GREY_400),
-                    )
-                )
+                self._itens_historico = {}
+                self.historico_list.controls = [self._historico_vazio]
             else:
-                for analise in self.analises_historico[:8]:  # Mostra até 8 análises
-                    prompt_resumo = analise.get('prompt', '')[:60] + "..." if len(analise.get('prompt', '')) > 60 else analise.get('prompt', '')
-                    timestamp = analise.get('timestamp', '')[:16] if analise.get('timestamp') else ''
-                    
-                    self.historico_list.controls.append(
-                        ft.ListTile(
-                            title=ft.Text(prompt_resumo, size=12),
-                            subtitle=ft.Text(f"{timestamp} | {analise.get('modelo_utilizado', 'N/A')}", 
-                                           size=10,
-                                           color=ft.Colors.GREY_600),
-                            leading=ft.Icon(ft.Icons.AUTO_AWESOME_MOSAIC, color=ft.Colors.BLUE_400),
-                            on_click=lambda e, a=analise: self._ver_analise_historico(a),
-                            dense=True
-                        )
-                    )
+                # Reaproveita os itens já montados; só as análises novas geram widgets
+                itens = {}
+                for analise in self.analises_historico[:_LIMITE_HISTORICO_RAG]:
+                    chave = (analise.get('id'), analise.get('timestamp'))
+                    item = self._itens_historico.get(chave)
+                    itens[chave] = item if item is not None else self._criar_item_historico(analise)
+                
+                # Histórico inalterado: evita reenviar a lista
+                if list(itens) == list(self._itens_historico):
+                    return
+                self._itens_historico = itens
+                self.historico_list.controls = list(itens.values())
             
-            if self.page:
-                self.page.update()
+            self._atualizar_pagina(self.historico_list)
                 
         except Exception as ex:
             logger.error(f"Erro ao carregar histórico: {ex}")
             self.notifier.error(f"Erro ao carregar histórico: {str(ex)}")
     
-    def _carregar_historico_sincrono(self):
-        """Versão síncrona para chamada a partir de threads"""
-        if self.page:
-            self._carregar_historico()
+    def _criar_item_historico(self, analise: Dict[str, Any]) -> ft.ListTile:
+        """Cria o item da lista de histórico para uma análise"""
+        get = analise.get
+        prompt = get('prompt') or ''
+        prompt_resumo = prompt[:60] + ("..." if len(prompt) > 60 else "")
+        timestamp = (get('timestamp') or '')[:16]
+        modelo = get('modelo_utilizado') or 'N/A'
+        
+        return ft.ListTile(
+            title=ft.Text(prompt_resumo, size=12),
+            subtitle=ft.Text(" | ".join((timestamp, modelo)), 
+                           size=10,
+                           color=ft.Colors.GREY_600),
+            leading=ft.Icon(_ICONE_HISTORICO, color=_COR_ICONE_HISTORICO),
+            on_click=functools.partial(self._ver_analise_historico, analise),
+            dense=True
+        )
     
-    def _ver_analise_historico(self, analise: Dict[str, Any]):
+    def _ver_analise_historico(self, analise: Dict[str, Any], e=None):
         """Exibe uma análise do histórico"""
-        self.prompt_completo_field.value = analise.get('prompt', '')
+        prompt = analise.get('prompt', '')
+        # Sem pergunta identificável, o prompt salvo é exibido inteiro
+        self.prompt_completo_field.value = prompt
         self._exibir_resultado(
             analise.get('analise_gerada', ''), 
-            analise.get('prompt', ''), 
+            prompt, 
             analise.get('modelo_utilizado')
         )
         
         # Tenta extrair a pergunta do usuário do prompt completo
-        prompt = analise.get('prompt', '')
-        if "PERGUNTA DO USUÁRIO:" in prompt:
-            partes = prompt.split("PERGUNTA DO USUÁRIO:")
-            if len(partes) > 1:
-                pergunta = partes[1].split("RESPOSTA:")[0].strip()
-                self.prompt_simples_field.value = pergunta
+        pergunta = self._extrair_pergunta(prompt)
+        if pergunta is not None:
+            self.prompt_simples_field.value = pergunta
+            self.prompt_completo_field.value = pergunta
+        # _exibir_resultado só envia a área de resultado; os campos do prompt seguem à parte
+        self._atualizar_pagina(self.prompt_simples_field, self.prompt_completo_field)
         
         self.notifier.info("Análise do histórico carregada!")
     
+    @staticmethod
+    def _extrair_pergunta(prompt: str) -> Optional[str]:
+        """Retorna o trecho entre "PERGUNTA DO USUÁRIO:" e "RESPOSTA:" (ou None se não houver pergunta)"""
+        inicio = prompt.find(_MARCADOR_PERGUNTA)
+        if inicio < 0:
+            return None
+        inicio += len(_MARCADOR_PERGUNTA)
+        # A pergunta termina na resposta ou em um novo marcador de pergunta, o que vier antes;
+        # o novo marcador só é procurado até a resposta, sem varrer o restante do prompt
+        fim = prompt.find(_MARCADOR_RESPOSTA, inicio)
+        if fim < 0:
+            fim = None
+        outra_pergunta = prompt.find(_MARCADOR_PERGUNTA, inicio, fim)
+        if outra_pergunta >= 0:
+            fim = outra_pergunta
+        return prompt[inicio:fim].strip()
+    
     def _testar_conexao_ollama(self, e):
         """Testa a conexão com o Ollama"""
         try:
             self.ollama_status.value = "🟡 Testando conexão..."
             self.ollama_status.color = ft.Colors.ORANGE_600
-            if self.page:
-                self.page.update()
+            self._atualizar_pagina(self.ollama_status)
             
             resultado = self.controller.testar_conexao_ollama()
             
@@ -854,60 +1065,90 @@ Forneça a análise em formato de relatório técnico."""
                 self.ollama_status.color = ft.Colors.RED_600
                 self.notifier.error("Falha na conexão com Ollama")
             
-            if self.page:
-                self.page.update()
+            self._atualizar_pagina(self.ollama_status)
                 
         except Exception as ex:
             logger.error(f"Erro ao testar conexão Ollama: {ex}")
             self.ollama_status.value = "🔴 Erro no teste"
             self.ollama_status.color = ft.Colors.RED_600
-            if self.page:
-                self.page.update()
+            self._atualizar_pagina(self.ollama_status)
     
     def _recarregar_contexto(self, e):
         """Recarrega o contexto atual"""
+        self._contexto_cache = (None, "")
         if self.controller.get_analise_atual():
             self._carregar_estatisticas(e)
         else:
             self.notifier.warning("Nenhuma análise disponível para recarregar")
     
+    def _abrir_link(self, e):
+        """Abre no navegador um link clicado no resultado"""
+        if self.page and e.data:
+            self.page.launch_url(e.data)
+    
     def _toggle_resultado(self, e):
         """Alterna a visibilidade da área de resultado"""
         self.resultado_area.visible = not self.resultado_area.visible
         e.control.icon = ft.Icons.EXPAND_LESS if self.resultado_area.visible else ft.Icons.EXPAND_MORE
-        if self.page:
-            self.page.update()
+        self._atualizar_pagina(self.resultado_area, e.control)
     
     def _show_info(self, e):
         """Mostra informações sobre o RAG Analyser"""
-        info_text = """
-🤖 **RAG Analyser**
-
-Este componente combina Retrieval-Augmented Generation (RAG) com análise de arquitetura:
-
-**Como funciona:**
-1. Carrega métricas da análise arquitetural
-2. Combina com sua pergunta em um prompt contextualizado  
-3. Envia para um modelo de LLM (Ollama)
-4. Retorna análise específica baseada no contexto
-
-**Contexto incluído:**
-• Estatísticas do sistema (componentes, dependências)
-• Métricas de qualidade (acoplamento, coesão, modularidade)
-• Análise contextual e pontos de atenção
-
-**Use para:**
-• Análises técnicas detalhadas
-• Sugestões de refatoração
-• Identificação de problemas
-• Recomendações de melhorias
-"""
-        self.notifier.info(info_text)
+        self.notifier.info(_TEXTO_INFO)
+    
+    def close(self):
+        """Encerra o card: cancela a análise em andamento e ignora atualizações posteriores"""
+        self._encerrado = True
+        self.analise_em_andamento = False
+        # Invalida trechos de streaming ainda em trânsito
+        self._execucao_stream += 1
+        future, self._analise_future = self._analise_future, None
+        if future is not None:
+            future.cancel()
+    
+    @contextmanager
+    def _atualizacao_agrupada(self):
+        """Adia os page.update() feitos dentro do bloco para um único envio ao final (aninhável)"""
+        self._profundidade_atualizacao += 1
+        try:
+            yield
+        finally:
+            self._profundidade_atualizacao -= 1
+            if self._profundidade_atualizacao == 0 and self._atualizacao_pendente:
+                self._atualizacao_pendente = False
+                self._atualizar_pagina()
+    
+    def _atualizar_pagina(self, *controles):
+        """Atualiza a página (ou apenas `controles`), adiando o envio enquanto houver um bloco agrupado aberto"""
+        if self._profundidade_atualizacao:
+            self._atualizacao_pendente = True
+            return
+        if self._encerrado or not self.page:
+            return
+        try:
+            if controles:
+                atualizar_controles(self.page, *controles)
+            else:
+                self.page.update()
+        except Exception as ex:
+            # Página desconectada: encerra o card em vez de seguir enviando atualizações
+            logger.warning(f"Página indisponível, encerrando o analisador RAG: {ex}")
+            self.close()
     
     def set_page(self, page: ft.Page):
         """Define a página para atualizações"""
         self.page = page
-        # Carrega histórico inicial
+        # A carga inicial usa os controles do card; se ainda não foi montado, build() a dispara
+        if self._card is not None:
+            self._iniciar_carga_inicial()
+    
+    def _iniciar_carga_inicial(self):
+        """Dispara a carga inicial fora da thread da UI"""
+        # Histórico e teste do Ollama (requisição HTTP) fora da thread da UI para não atrasar a primeira renderização
+        threading.Thread(target=self._inicializar_em_segundo_plano, daemon=True).start()
+    
+    def _inicializar_em_segundo_plano(self):
+        """Carrega o histórico inicial e testa a conexão com o Ollama"""
         self._carregar_historico()
-        # Testa conexão Ollama inicial
-        self._testar_conexao_ollama(None)
\ No newline at end of file
+        if not self._encerrado:
+            self._testar_conexao_ollama(None)
\ No newline at end of file
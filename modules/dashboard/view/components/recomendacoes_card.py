@@ -1,24 +1,49 @@
 # modules/dashboard/view/components/recomendacoes_card.py
 
 import flet as ft
+from .cabecalho_card import criar_cabecalho_card
+from .atualizacao import atualizar_controles
+
+# Marcador que separa as recomendações geradas pelo storytelling
+_MARCADOR = '• '
+# Ícone de cada linha da lista (lidos uma vez, não a cada recomendação)
+_ICONE_RECOMENDACAO = ft.Icons.CHEVRON_RIGHT
+_COR_ICONE_RECOMENDACAO = ft.Colors.BLUE_500
+
+
+def _dividir_recomendacoes(texto: str):
+    """Gera as recomendações não vazias entre os marcadores, sem montar a lista intermediária"""
+    pos = 0
+    while True:
+        proximo = texto.find(_MARCADOR, pos)
+        trecho = texto[pos:proximo if proximo != -1 else None].strip()
+        if trecho:
+            yield trecho
+        if proximo == -1:
+            return
+        pos = proximo + len(_MARCADOR)
+
 
 class RecomendacoesCard:
+    __slots__ = ('controller', 'notifier', 'page', 'lista_recomendacoes', '_estado_vazio', '_suprimir_atualizacao')
+    
     def __init__(self, controller, notifier):
         self.controller = controller
         self.notifier = notifier
         self.page = None
+        # Ligado pelo ViewManager durante a atualização em lote (um único page.update() ao final)
+        self._suprimir_atualizacao = False
         
     def build(self) -> ft.Card:
-        self.lista_recomendacoes = ft.Column(scroll=ft.ScrollMode.ADAPTIVE)
+        # ListView só renderiza os itens visíveis, mesmo com muitas recomendações
+        self.lista_recomendacoes = ft.ListView(spacing=4)
+        self._estado_vazio = ft.Text("Nenhuma recomendação no momento", color=ft.Colors.GREY_600)
         
         return ft.Card(
             content=ft.Container(
                 content=ft.Column([
-                    ft.ListTile(
-                        leading=ft.Icon(ft.Icons.LIGHTBULB, color=ft.Colors.ORANGE_500),
-                        title=ft.Text("Recomendações", weight=ft.FontWeight.BOLD),
-                        subtitle=ft.Text("Ações sugeridas para melhoria")
-                    ),
+                    criar_cabecalho_card(ft.Icons.LIGHTBULB, ft.Colors.ORANGE_500, "Recomendações",
+                                         "Ações sugeridas para melhoria"),
                     ft.Divider(),
                     ft.Container(
                         content=self.lista_recomendacoes,
@@ -32,26 +57,27 @@ class RecomendacoesCard:
     
     def atualizar_recomendacoes(self, recomendacoes: str):
         """Atualiza a lista de recomendações"""
-        self.lista_recomendacoes.controls.clear()
-        
         if not recomendacoes:
-            self.lista_recomendacoes.controls.append(
-                ft.Text("Nenhuma recomendação no momento", color=ft.Colors.GREY_600)
-            )
+            # Estado vazio já exibido: nada a reenviar
+            controles = self.lista_recomendacoes.controls
+            if len(controles) == 1 and controles[0] is self._estado_vazio:
+                return
+            self.lista_recomendacoes.controls = [self._estado_vazio]
+            if self.page and not self._suprimir_atualizacao:
+                atualizar_controles(self.page, self.lista_recomendacoes)
             return
             
-        # Divide as recomendações por bullet points
-        for line in recomendacoes.split('• '):
-            if line.strip():
-                self.lista_recomendacoes.controls.append(
-                    ft.Row([
-                        ft.Icon(ft.Icons.CHEVRON_RIGHT, size=16, color=ft.Colors.BLUE_500),
-                        ft.Text(line.strip(), size=14, expand=True)
-                    ])
-                )
+        # Divide as recomendações por bullet points e substitui o conteúdo da lista de uma vez
+        self.lista_recomendacoes.controls[:] = [
+            ft.Row([
+                ft.Icon(_ICONE_RECOMENDACAO, size=16, color=_COR_ICONE_RECOMENDACAO),
+                ft.Text(line, size=14, expand=True)
+            ])
+            for line in _dividir_recomendacoes(recomendacoes)
+        ]
         
-        if self.page:
-            self.page.update()
+        if self.page and not self._suprimir_atualizacao:
+            atualizar_controles(self.page, self.lista_recomendacoes)
     
     def set_page(self, page: ft.Page):
         """Define a página para atualizações"""
@@ -2,14 +2,40 @@
 
 import flet as ft
 from typing import Dict
+from .cabecalho_card import criar_cabecalho_card
+from .atualizacao import atualizar_controles
+
+# Seções exibidas no card: (título, chave no storytelling)
+_SECOES = (
+    ("📊 Resumo da Arquitetura", 'resumo_geral'),
+    ("💡 Insights Técnicos", 'insights_tecnicos'),
+    ("⚠️ Pontos de Atenção", 'pontos_atencao'),
+)
 
 class StorytellingCard:
+    __slots__ = ('controller', 'notifier', 'page', 'conteudo_storytelling', '_estado_vazio', '_suprimir_atualizacao',
+                 '_textos_secoes', '_controles_secoes')
+    
     def __init__(self, controller, notifier):
         self.controller = controller
         self.notifier = notifier
         self.page = None
+        # Ligado pelo ViewManager durante a atualização em lote (um único page.update() ao final)
+        self._suprimir_atualizacao = False
         
     def build(self) -> ft.Card:
+        # Seções montadas uma vez a partir de _SECOES; atualizar_storytelling só troca os textos
+        self._textos_secoes = [ft.Text("", size=14) for _ in _SECOES]
+        self._controles_secoes = []
+        for (titulo, _), texto in zip(_SECOES, self._textos_secoes):
+            self._controles_secoes += [ft.Text(titulo, size=16, weight=ft.FontWeight.BOLD), texto, ft.Divider()]
+        self._controles_secoes.pop()  # sem divisor após a última seção
+        # Conteúdo exibido quando não há storytelling (criado uma vez e atribuído por referência)
+        self._estado_vazio = [
+            ft.Text("📊 Análise Contextual", size=16, weight=ft.FontWeight.BOLD),
+            ft.Text("Execute a análise completa para ver insights detalhados...", 
+                   color=ft.Colors.GREY_600)
+        ]
         self.conteudo_storytelling = ft.Column([
             ft.Text("Análise Contextual", size=16, weight=ft.FontWeight.BOLD),
             ft.Text("Execute a análise para ver insights sobre a arquitetura...", 
@@ -19,11 +45,8 @@ class StorytellingCard:
         return ft.Card(
             content=ft.Container(
                 content=ft.Column([
-                    ft.ListTile(
-                        leading=ft.Icon(ft.Icons.ANALYTICS, color=ft.Colors.PURPLE_500),
-                        title=ft.Text("Storytelling & Insights", weight=ft.FontWeight.BOLD),
-                        subtitle=ft.Text("Narrativa contextual das métricas")
-                    ),
+                    criar_cabecalho_card(ft.Icons.ANALYTICS, ft.Colors.PURPLE_500, "Storytelling & Insights",
+                                         "Narrativa contextual das métricas"),
                     ft.Divider(),
                     ft.Container(
                         content=self.conteudo_storytelling,
@@ -38,33 +61,21 @@ class StorytellingCard:
     
     def atualizar_storytelling(self, storytelling: Dict[str, str]):
         """Atualiza o conteúdo de storytelling"""
-        self.conteudo_storytelling.controls.clear()
-        
         if not storytelling:
-            self.conteudo_storytelling.controls.extend([
-                ft.Text("📊 Análise Contextual", size=16, weight=ft.FontWeight.BOLD),
-                ft.Text("Execute a análise completa para ver insights detalhados...", 
-                       color=ft.Colors.GREY_600)
-            ])
+            # Estado vazio já exibido: nada a reenviar
+            if self.conteudo_storytelling.controls is self._estado_vazio:
+                return
+            self.conteudo_storytelling.controls = self._estado_vazio
+            if self.page and not self._suprimir_atualizacao:
+                atualizar_controles(self.page, self.conteudo_storytelling)
             return
         
-        self.conteudo_storytelling.controls.extend([
-            ft.Text("📊 Resumo da Arquitetura", size=16, weight=ft.FontWeight.BOLD),
-            ft.Text(storytelling.get('resumo_geral', ''), size=14),
-            
-            ft.Divider(),
-            
-            ft.Text("💡 Insights Técnicos", size=16, weight=ft.FontWeight.BOLD),
-            ft.Text(storytelling.get('insights_tecnicos', ''), size=14),
-            
-            ft.Divider(),
-            
-            ft.Text("⚠️ Pontos de Atenção", size=16, weight=ft.FontWeight.BOLD),
-            ft.Text(storytelling.get('pontos_atencao', ''), size=14),
-        ])
+        for (_, chave), texto in zip(_SECOES, self._textos_secoes):
+            texto.value = storytelling.get(chave, '')
+        self.conteudo_storytelling.controls = self._controles_secoes
         
-        if self.page:
-            self.page.update()
+        if self.page and not self._suprimir_atualizacao:
+            atualizar_controles(self.page, self.conteudo_storytelling)
     
     def set_page(self, page: ft.Page):
         """Define a página para atualizações"""
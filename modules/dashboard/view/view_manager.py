@@ -2,15 +2,20 @@
 
 import flet as ft
 import logging
+import threading
 from .components.metricas_card import MetricasCard
 from .components.storytelling_card import StorytellingCard
 from .components.recomendacoes_card import RecomendacoesCard
 from .components.nos_criticos_card import NosCriticosCard
 from .components.historico_card import HistoricoCard
 from .components.rag_analyser import RagAnalyserCard
+from .components.debouncer import Debouncer
 
 logger = logging.getLogger(__name__)
 
+# Janela (s) para agrupar atualizações do dashboard disparadas em sequência
+_ESPERA_ATUALIZACAO = 0.05
+
 class ViewManager:
     def __init__(self, controller, notifier, page: ft.Page):
         self.controller = controller
@@ -27,6 +32,28 @@ class ViewManager:
         self.historico_card = HistoricoCard(controller, notifier)
         self.rag_analyser_card = RagAnalyserCard(controller, notifier)
         
+        # Métodos de atualização resolvidos uma vez (None se o card não os oferecer)
+        self._atualizar_metricas = getattr(self.metricas_card, 'atualizar_metricas', None)
+        self._atualizar_storytelling = getattr(self.storytelling_card, 'atualizar_storytelling', None)
+        self._atualizar_recomendacoes = getattr(self.recomendacoes_card, 'atualizar_recomendacoes', None)
+        self._atualizar_nos_criticos = getattr(self.nos_criticos_card, 'atualizar_nos_criticos', None)
+        self._carregar_historico = getattr(self.historico_card, '_carregar_historico', None)
+        
+        # Sinaliza o cancelamento da análise completa em execução
+        self._cancelamento_analise = threading.Event()
+        # Impede duas análises completas simultâneas (ex.: clique duplo)
+        self._analise_lock = threading.Lock()
+        
+        # Agrupa atualizações seguidas dos componentes em uma única renderização
+        self._debouncer_atualizacao = Debouncer(_ESPERA_ATUALIZACAO)
+        
+        # View principal, criada na primeira chamada e reaproveitada nas seguintes
+        self._view = None
+        # Espaço do RAG Analyser: o card (o mais pesado) só é montado na primeira rolagem ou ao ser aberto
+        self._container_rag = None
+        self._rag_construido = False
+        self._rag_lock = threading.Lock()
+        
         # Define a página em todos os componentes
         self._set_page_in_components()
         
@@ -46,7 +73,41 @@ class ViewManager:
                     logger.error(f"Erro ao definir página no componente {type(componente).__name__}: {e}")
         
     def __call__(self) -> ft.Container:
-        """Retorna a view principal do dashboard"""
+        """Retorna a view principal do dashboard (montada uma única vez)"""
+        if self._view is None:
+            self._view = self._construir_view()
+        return self._view
+    
+    def _construir_view(self) -> ft.Container:
+        """Monta a árvore de controles da view principal"""
+        self.botao_analise = ft.ElevatedButton(
+            "🚀 Executar Análise Completa",
+            icon=ft.Icons.PLAY_ARROW,
+            on_click=self._executar_analise_completa,
+            style=ft.ButtonStyle(
+                color=ft.Colors.WHITE,
+                bgcolor=ft.Colors.GREEN_600,
+                padding=ft.padding.symmetric(horizontal=25, vertical=15)
+            )
+        )
+        self.botao_cancelar = ft.OutlinedButton(
+            "Cancelar",
+            icon=ft.Icons.STOP,
+            on_click=self._cancelar_analise_completa,
+            visible=False
+        )
+        self.barra_progresso = ft.ProgressBar(value=0, visible=False)
+        self.texto_progresso = ft.Text("", size=12, color=ft.Colors.GREY_600, visible=False)
+        # Sem rolagem (janela alta o bastante), o botão monta o RAG Analyser
+        self._container_rag = ft.Container(
+            content=ft.Row([
+                ft.Icon(ft.Icons.SMART_TOY, color=ft.Colors.DEEP_PURPLE_500),
+                ft.Text("Analisador RAG com IA", size=14, weight=ft.FontWeight.BOLD),
+                ft.TextButton("Abrir", icon=ft.Icons.EXPAND_MORE, on_click=self._construir_rag)
+            ]),
+            padding=10
+        )
+        
         return ft.Container(
             content=ft.Column([
                 # Cabeçalho
@@ -77,16 +138,8 @@ class ViewManager:
                                 ),
                                 ft.Container(
                                     content=ft.Row([
-                                        ft.ElevatedButton(
-                                            "🚀 Executar Análise Completa",
-                                            icon=ft.Icons.PLAY_ARROW,
-                                            on_click=self._executar_analise_completa,
-                                            style=ft.ButtonStyle(
-                                                color=ft.Colors.WHITE,
-                                                bgcolor=ft.Colors.GREEN_600,
-                                                padding=ft.padding.symmetric(horizontal=25, vertical=15)
-                                            )
-                                        ),
+                                        self.botao_analise,
+                                        self.botao_cancelar,
                                         ft.ElevatedButton(
                                             "🔄 Atualizar Dashboard",
                                             icon=ft.Icons.REFRESH,
@@ -98,6 +151,10 @@ class ViewManager:
                                         )
                                     ]),
                                     padding=15
+                                ),
+                                ft.Container(
+                                    content=ft.Column([self.barra_progresso, self.texto_progresso]),
+                                    padding=ft.padding.symmetric(horizontal=15)
                                 )
                             ]),
                             padding=10
@@ -118,11 +175,8 @@ class ViewManager:
                     self.nos_criticos_card.build()
                 ], expand=True),
                 
-                # RAG Analyser (ocupando linha completa)
-                ft.Container(
-                    content=self.rag_analyser_card.build(),
-                    padding=10
-                ),
+                # RAG Analyser (ocupando linha completa; montado sob demanda)
+                self._container_rag,
                 
                 # Histórico
                 ft.Container(
@@ -130,23 +184,88 @@ class ViewManager:
                     padding=10
                 )
                 
-            ], scroll=ft.ScrollMode.ADAPTIVE),
+            ], scroll=ft.ScrollMode.ADAPTIVE, on_scroll=self._ao_rolar_dashboard),
             padding=20,
             expand=True
         )
     
+    def _ao_rolar_dashboard(self, e):
+        """Monta o RAG Analyser quando o usuário começa a rolar em direção a ele"""
+        # O evento só serve para montar o card; depois disso a coluna deixa de enviar a rolagem ao Python
+        e.control.on_scroll = None
+        if self._rag_construido:
+            e.control.update()
+        else:
+            self._construir_rag()
+    
+    def _construir_rag(self, e=None):
+        """Substitui o espaço reservado pelo card do RAG Analyser (apenas uma vez)"""
+        with self._rag_lock:
+            if self._rag_construido or self._container_rag is None:
+                return
+            self._rag_construido = True
+        try:
+            self._container_rag.content = self.rag_analyser_card.build()
+            if self.page:
+                self.page.update()
+        except Exception as ex:
+            logger.error(f"Erro ao montar o RAG Analyser: {ex}")
+    
     def _executar_analise_completa(self, e):
-        """Executa análise completa"""
+        """Executa análise completa em thread separada para não travar a UI"""
+        if not self._analise_lock.acquire(blocking=False):
+            self.notifier.warning("Já existe uma análise em andamento!")
+            return
+        
+        self._cancelamento_analise.clear()
+        self._definir_analise_em_andamento(True)
+        threading.Thread(target=self._processar_analise_completa, daemon=True).start()
+    
+    def _processar_analise_completa(self):
+        """Processa a análise completa (executado fora da thread de eventos)"""
         try:
-            resultado = self.controller.processar_analise_completa()
+            resultado = self.controller.processar_analise_completa(
+                progress_callback=self._atualizar_progresso_analise,
+                stop_event=self._cancelamento_analise
+            )
             if resultado:
-                self._atualizar_todos_componentes(resultado)
+                self._debouncer_atualizacao.agendar(self._atualizar_todos_componentes, resultado)
                 self.notifier.success("✅ Análise completa concluída! Dashboard atualizado.")
-            else:
+            elif not self._cancelamento_analise.is_set():
                 self.notifier.error("❌ Falha na análise. Verifique se há dados de grafo disponíveis.")
         except Exception as ex:
             logger.error(f"Erro na análise completa: {ex}")
             self.notifier.error(f"Erro na análise: {str(ex)}")
+        finally:
+            self._analise_lock.release()
+            self._definir_analise_em_andamento(False)
+    
+    def _cancelar_analise_completa(self, e):
+        """Solicita o cancelamento da análise completa (atendido entre as fases)"""
+        self._cancelamento_analise.set()
+        self.botao_cancelar.disabled = True
+        if self.page:
+            self.page.update()
+    
+    def _atualizar_progresso_analise(self, progresso: float, mensagem: str):
+        """Atualiza a barra de progresso com a fase atual da análise"""
+        self.barra_progresso.value = progresso
+        self.texto_progresso.value = mensagem
+        if self.page:
+            self.page.update()
+    
+    def _definir_analise_em_andamento(self, em_andamento: bool):
+        """Alterna botões e progresso enquanto a análise está em execução"""
+        self.botao_analise.disabled = em_andamento
+        self.botao_cancelar.visible = em_andamento
+        self.botao_cancelar.disabled = False
+        self.barra_progresso.visible = em_andamento
+        self.texto_progresso.visible = em_andamento
+        if em_andamento:
+            self.barra_progresso.value = 0
+            self.texto_progresso.value = ""
+        if self.page:
+            self.page.update()
     
     def _atualizar_dashboard(self, e):
         """Atualiza o dashboard com dados existentes"""
@@ -154,7 +273,7 @@ class ViewManager:
             # Verifica se há análise atual disponível
             analise_atual = self.controller.get_analise_atual()
             if analise_atual:
-                self._atualizar_todos_componentes(analise_atual)
+                self._debouncer_atualizacao.agendar(self._atualizar_todos_componentes, analise_atual)
                 self.notifier.info("📊 Dashboard atualizado com análise existente")
             else:
                 self.notifier.warning("Nenhuma análise disponível. Execute a análise completa primeiro.")
@@ -164,35 +283,50 @@ class ViewManager:
     
     def _atualizar_todos_componentes(self, analise: dict):
         """Atualiza todos os componentes com os dados da análise"""
+        # Os cards não chamam page.update() durante o lote; a página é enviada uma vez ao final
+        cards = (self.metricas_card, self.storytelling_card, self.recomendacoes_card,
+                 self.nos_criticos_card, self.historico_card)
+        for card in cards:
+            card._suprimir_atualizacao = True
         try:
+            # Extrai uma vez os dados de cada card (seções ausentes ou None viram vazias)
+            metricas = analise.get('metricas_avancadas') or {}
+            storytelling = analise.get('storytelling') or {}
+            recomendacoes = storytelling.get('recomendacoes') or ''
+            nos_criticos = (analise.get('resultado_grafo') or {}).get('nos_criticos') or []
+            
             # Atualiza métricas
-            if hasattr(self.metricas_card, 'atualizar_metricas'):
-                metricas = analise.get('metricas_avancadas', {})
-                self.metricas_card.atualizar_metricas(metricas)
+            if self._atualizar_metricas:
+                self._atualizar_metricas(metricas)
             
             # Atualiza storytelling
-            if hasattr(self.storytelling_card, 'atualizar_storytelling'):
-                storytelling = analise.get('storytelling', {})
-                self.storytelling_card.atualizar_storytelling(storytelling)
+            if self._atualizar_storytelling:
+                self._atualizar_storytelling(storytelling)
             
             # Atualiza recomendações
-            if hasattr(self.recomendacoes_card, 'atualizar_recomendacoes'):
-                recomendacoes = storytelling.get('recomendacoes', '') if storytelling else ''
-                self.recomendacoes_card.atualizar_recomendacoes(recomendacoes)
+            if self._atualizar_recomendacoes:
+                self._atualizar_recomendacoes(recomendacoes)
             
             # Atualiza nós críticos
-            if hasattr(self.nos_criticos_card, 'atualizar_nos_criticos'):
-                resultado_grafo = analise.get('resultado_grafo', {})
-                nos_criticos = resultado_grafo.get('nos_criticos', [])
-                self.nos_criticos_card.atualizar_nos_criticos(nos_criticos)
+            if self._atualizar_nos_criticos:
+                self._atualizar_nos_criticos(nos_criticos)
             
             # Atualiza histórico
-            if hasattr(self.historico_card, '_carregar_historico'):
-                self.historico_card._carregar_historico()
+            if self._carregar_historico:
+                self._carregar_historico()
             
-            # Força atualização da página
-            if self.page:
-                self.page.update()
-                
         except Exception as ex:
-            logger.error(f"Erro ao atualizar componentes: {ex}")
\ No newline at end of file
+            logger.error(f"Erro ao atualizar componentes: {ex}")
+        finally:
+            for card in cards:
+                card._suprimir_atualizacao = False
+        
+        # Única atualização da página para todos os cards
+        if self.page:
+            self.page.update()
+    
+    def close(self):
+        """Libera os recursos dos componentes (workers em segundo plano)"""
+        self.rag_analyser_card.close()
+        self._view = None
+        self._container_rag = None
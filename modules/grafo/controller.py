@@ -1,5 +1,6 @@
 # modules/grafo/controller.py
 
+import heapq
 import os
 import json
 import time
@@ -7,6 +8,7 @@ from typing import List, Dict, Any, Tuple, Set
 import logging
 import networkx as nx  
 from collections import Counter
+from itertools import islice
 from .model import GrafoModel, HAS_LOUVAIN
 """
 Controller do módulo de grafos.
@@ -14,9 +16,36 @@ Controller do módulo de grafos.
 Gerencia a visualização e manipulação de grafos de chamada.
 """
 
+try:
+    import orjson  # Leitura JSON mais rápida, se disponível
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 logger = logging.getLogger(__name__)
 
+
+def _carregar_json(arquivo_path: str) -> Any:
+    """Lê e decodifica um arquivo JSON (com orjson, se disponível)"""
+    with open(arquivo_path, 'rb') as f:
+        conteudo = f.read()
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(conteudo)
+        except orjson.JSONDecodeError:
+            # orjson é mais estrito (ex.: NaN, inteiros enormes); o json padrão dá a palavra final
+            pass
+    return json.loads(conteudo)
+
+
+def _amostrar_tipos(itens: Any, amostra: int = 10) -> Set[Any]:
+    """Tipos ('type') dos primeiros itens de uma lista de nodes/edges"""
+    if not isinstance(itens, list):
+        return set()
+    return {item.get('type', 'unknown') for item in islice(itens, amostra) if isinstance(item, dict)}
+
+
 class GrafoController:
     def __init__(self, model: GrafoModel, notifier=None):
         self.model = model
@@ -36,109 +65,121 @@ class GrafoController:
         Analisa o schema de um arquivo JSON e retorna sua estrutura
         """
         try:
-            with open(arquivo_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            schema = {
-                'campos_raiz': set(data.keys()),
-                'tem_analise_json': 'analise_json' in data,
-                'tem_nodes': False,
-                'tem_edges': False,
-                'tipos_nodes': set(),
-                'tipos_edges': set(),
-                'total_nodes': 0,
-                'total_edges': 0,
-                'estrutura_valida': False
-            }
-            
-            if 'analise_json' in data and isinstance(data['analise_json'], dict):
-                analise_json = data['analise_json']
-                schema['tem_nodes'] = 'nodes' in analise_json
-                schema['tem_edges'] = 'edges' in analise_json
-                
-                if schema['tem_nodes'] and isinstance(analise_json['nodes'], list):
-                    schema['total_nodes'] = len(analise_json['nodes'])
-                    # Analisa tipos de nodes
-                    for node in analise_json['nodes'][:10]:  # Amostra dos primeiros 10
-                        if isinstance(node, dict):
-                            node_type = node.get('type', 'unknown')
-                            schema['tipos_nodes'].add(node_type)
-                
-                if schema['tem_edges'] and isinstance(analise_json['edges'], list):
-                    schema['total_edges'] = len(analise_json['edges'])
-                    # Analisa tipos de edges
-                    for edge in analise_json['edges'][:10]:  # Amostra dos primeiros 10
-                        if isinstance(edge, dict):
-                            edge_type = edge.get('type', 'unknown')
-                            schema['tipos_edges'].add(edge_type)
-                
-                schema['estrutura_valida'] = schema['tem_nodes'] or schema['tem_edges']
-            
-            return schema
-            
+            return self._extrair_schema(_carregar_json(arquivo_path))
         except Exception as e:
             return {
                 'erro': str(e),
                 'estrutura_valida': False
             }
     
+    @staticmethod
+    def _extrair_schema(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extrai do JSON já carregado só os campos do schema (chaves, totais e amostra de tipos)"""
+        campos_raiz = set(data.keys())
+        analise_json = data.get('analise_json')
+        if not isinstance(analise_json, dict):
+            analise_json = {}
+        
+        nodes = analise_json.get('nodes')
+        edges = analise_json.get('edges')
+        tem_nodes = 'nodes' in analise_json
+        tem_edges = 'edges' in analise_json
+        
+        return {
+            'campos_raiz': campos_raiz,
+            'tem_analise_json': 'analise_json' in data,
+            'tem_nodes': tem_nodes,
+            'tem_edges': tem_edges,
+            # Tipos amostrados dos primeiros 10 itens, sem copiar as listas
+            'tipos_nodes': _amostrar_tipos(nodes),
+            'tipos_edges': _amostrar_tipos(edges),
+            'total_nodes': len(nodes) if isinstance(nodes, list) else 0,
+            'total_edges': len(edges) if isinstance(edges, list) else 0,
+            'estrutura_valida': tem_nodes or tem_edges
+        }
+    
     def validar_consistencia_arquivo(self, arquivo_path: str) -> Tuple[bool, str]:
         """
         Valida a consistência de um arquivo JSON
         Retorna (é_válido, mensagem_erro)
         """
         try:
-            with open(arquivo_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Verificação básica de estrutura
-            if not isinstance(data, dict):
-                return False, "Estrutura raiz não é um dicionário"
-            
-            if 'analise_json' not in data:
-                return False, "Campo 'analise_json' não encontrado"
-            
-            analise_json = data.get('analise_json', {})
-            if not isinstance(analise_json, dict):
-                return False, "analise_json não é um dicionário"
-            
-            # Valida nodes
-            if 'nodes' in analise_json:
-                nodes = analise_json['nodes']
-                if not isinstance(nodes, list):
-                    return False, "nodes não é uma lista"
-                
-                for i, node in enumerate(nodes):
-                    if not isinstance(node, dict):
-                        return False, f"Node {i} não é um dicionário"
-                    
-                    node_id = self.model._extrair_node_id(node)
-                    if not node_id:
-                        return False, f"Node {i} sem ID válido"
-            
-            # Valida edges
-            if 'edges' in analise_json:
-                edges = analise_json['edges']
-                if not isinstance(edges, list):
-                    return False, "edges não é uma lista"
-                
-                for i, edge in enumerate(edges):
-                    if not isinstance(edge, dict):
-                        return False, f"Edge {i} não é um dicionário"
-                    
-                    source = edge.get('source') or edge.get('from')
-                    target = edge.get('target') or edge.get('to')
-                    
-                    if not source or not target:
-                        return False, f"Edge {i} sem source ou target válidos"
-            
-            return True, "OK"
-            
+            return self._validar_dados(_carregar_json(arquivo_path))
         except json.JSONDecodeError as e:
             return False, f"JSON inválido: {str(e)}"
         except Exception as e:
             return False, f"Erro na leitura: {str(e)}"
     
+    def _validar_dados(self, data: Any) -> Tuple[bool, str]:
+        """Valida a consistência de um JSON já carregado; retorna (é_válido, mensagem_erro)"""
+        # Verificação básica de estrutura
+        if not isinstance(data, dict):
+            return False, "Estrutura raiz não é um dicionário"
+        
+        if 'analise_json' not in data:
+            return False, "Campo 'analise_json' não encontrado"
+        
+        analise_json = data.get('analise_json', {})
+        if not isinstance(analise_json, dict):
+            return False, "analise_json não é um dicionário"
+        
+        # Valida nodes
+        if 'nodes' in analise_json:
+            nodes = analise_json['nodes']
+            if not isinstance(nodes, list):
+                return False, "nodes não é uma lista"
+            
+            for i, node in enumerate(nodes):
+                if not isinstance(node, dict):
+                    return False, f"Node {i} não é um dicionário"
+                
+                node_id = self.model._extrair_node_id(node)
+                if not node_id:
+                    return False, f"Node {i} sem ID válido"
+        
+        # Valida edges
+        if 'edges' in analise_json:
+            edges = analise_json['edges']
+            if not isinstance(edges, list):
+                return False, "edges não é uma lista"
+            
+            for i, edge in enumerate(edges):
+                if not isinstance(edge, dict):
+                    return False, f"Edge {i} não é um dicionário"
+                
+                source = edge.get('source') or edge.get('from')
+                target = edge.get('target') or edge.get('to')
+                
+                if not source or not target:
+                    return False, f"Edge {i} sem source ou target válidos"
+        
+        return True, "OK"
+    
+    def _analisar_e_validar(self, arquivo_path: str) -> Tuple[bool, str, Dict[str, Any]]:
+        """
+        Valida e analisa o schema de um arquivo JSON com uma única leitura
+        Retorna (é_válido, mensagem_erro, schema); o schema só é extraído de arquivos válidos
+        """
+        try:
+            data = _carregar_json(arquivo_path)
+            valido, mensagem = self._validar_dados(data)
+        except json.JSONDecodeError as e:
+            return False, f"JSON inválido: {str(e)}", {}
+        except Exception as e:
+            return False, f"Erro na leitura: {str(e)}", {}
+        
+        if not valido:
+            return False, mensagem, {}
+        
+        try:
+            schema = self._extrair_schema(data)
+        except Exception as e:
+            schema = {
+                'erro': str(e),
+                'estrutura_valida': False
+            }
+        return True, mensagem, schema
+    
     def encontrar_schema_mais_comum(self, schemas: List[Dict]) -> Dict:
         """
         Encontra o schema mais comum entre os arquivos válidos
@@ -201,8 +242,8 @@ class GrafoController:
             for arquivo in arquivos_encontrados:
                 nome_arquivo = os.path.basename(arquivo)
                 
-                # Valida consistência
-                valido, mensagem_erro = self.validar_consistencia_arquivo(arquivo)
+                # Valida consistência e extrai o schema com uma única leitura do arquivo
+                valido, mensagem_erro, schema = self._analisar_e_validar(arquivo)
                 
                 if not valido:
                     self.arquivos_rejeitados.append({
@@ -214,8 +255,6 @@ class GrafoController:
                     logger.warning(f"❌ Arquivo inconsistente: {nome_arquivo} - {mensagem_erro}")
                     continue
                 
-                # Analisa schema
-                schema = self.analisar_schema_arquivo(arquivo)
                 schema['arquivo'] = nome_arquivo
                 schemas_analisados.append(schema)
                 
@@ -414,13 +453,14 @@ class GrafoController:
             logger.info("🔄 Carregando grafo a partir dos arquivos selecionados...")
             grafo = self.model.carregar_json_para_grafo(arquivos_json)
             
-            if grafo.number_of_nodes() == 0:
+            num_nodes = grafo.number_of_nodes()
+            if num_nodes == 0:
                 logger.error("❌ Grafo vazio - nenhum nó válido nos arquivos selecionados")
                 if self.notifier:
                     self.notifier.error("Nenhum dado válido nos arquivos selecionados")
                 return {}
             
-            logger.info(f"✅ Grafo carregado: {grafo.number_of_nodes()} nós, {grafo.number_of_edges()} arestas")
+            logger.info(f"✅ Grafo carregado: {num_nodes} nós, {grafo.number_of_edges()} arestas")
             
             # Detecta comunidades
             logger.info("🔄 Detectando comunidades...")
@@ -437,6 +477,7 @@ class GrafoController:
             
             self.resultado_atual = {
                 "grafo": grafo,
+                "num_nodes": num_nodes,
                 "comunidades": comunidades,
                 "html_path": html_path,
                 "estatisticas": estatisticas,
@@ -451,7 +492,7 @@ class GrafoController:
             msg_final = (
                 f"Processamento concluído! "
                 f"{len(arquivos_json)} arquivos consistentes, "
-                f"{grafo.number_of_nodes()} nós, {grafo.number_of_edges()} arestas"
+                f"{num_nodes} nós, {grafo.number_of_edges()} arestas"
             )
             
             logger.info(f"🎉 {msg_final}")
@@ -480,16 +521,19 @@ class GrafoController:
             comunidades = resultado.get('comunidades', {})
             arquivos_rejeitados = resultado.get('arquivos_rejeitados', [])
             arquivos_schema_diferente = resultado.get('arquivos_schema_diferente', [])
+            num_nodes = resultado.get('num_nodes')
+            if num_nodes is None:
+                num_nodes = grafo.number_of_nodes() if grafo else 0
             
             # Prepara nós críticos
             nos_criticos = []
-            if grafo and grafo.number_of_nodes() > 0:
+            if grafo and num_nodes > 0:
                 try:
-                    degrees = dict(grafo.degree())
-                    top_nos = sorted(degrees.items(), key=lambda x: x[1], reverse=True)[:10]
+                    # Top 10 por grau sem ordenar todos os nós (mesma ordem do sorted estável)
+                    top_nos = heapq.nlargest(10, grafo.degree(), key=lambda x: x[1])
                     
                     for node_id, grau in top_nos:
-                        centralidade = grau / (grafo.number_of_nodes() - 1) if grafo.number_of_nodes() > 1 else 0
+                        centralidade = grau / (num_nodes - 1) if num_nodes > 1 else 0
                         nos_criticos.append({
                             'node_id': node_id,
                             'centralidade_grau': round(centralidade, 4),
@@ -500,6 +544,7 @@ class GrafoController:
             
             return {
                 'grafo': grafo,
+                'num_nodes': num_nodes,
                 'estatisticas': estatisticas,
                 'comunidades': comunidades,
                 'nos_criticos': nos_criticos,
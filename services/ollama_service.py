@@ -21,7 +21,7 @@ import logging
 import subprocess
 import json
 import time
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -60,6 +60,23 @@ class OllamaService:
         self.available_models = []
         self._last_error = None  # 🔥 Armazena última mensagem de erro para debugging
         
+    def set_base_url(self, base_url: str) -> bool:
+        """
+        Atualiza a URL base do servidor Ollama sem recriar o serviço.
+
+        Args:
+            base_url (str): Nova URL base do servidor Ollama
+
+        Returns:
+            bool: True se a URL mudou, False se já era a mesma
+        """
+        if base_url == self.base_url:
+            return False
+
+        self.base_url = base_url
+        self.available_models = []  # Modelos pertencem ao servidor anterior
+        return True
+        
     def check_connection(self) -> bool:
         """
         Verifica se o servidor Ollama está acessível.
@@ -95,6 +112,32 @@ class OllamaService:
             logger.error(f"Erro ao obter modelos disponíveis: {e}")
             return []
     
+    def get_status(self) -> Tuple[bool, List[str]]:
+        """
+        Verifica a conexão e lista os modelos com uma única requisição.
+
+        Substitui o par check_connection() + get_available_models(), que
+        consultava /api/tags duas vezes em sequência.
+
+        Returns:
+            Tuple[bool, List[str]]: (servidor acessível, modelos disponíveis)
+        """
+        try:
+            response = requests.get(f"{self.base_url}/api/tags", timeout=60)
+        except Exception as e:
+            logger.error(f"Erro ao conectar com Ollama: {e}")
+            return False, []
+        
+        if response.status_code != 200:
+            logger.error(f"Erro ao obter modelos: {response.status_code}")
+            return False, []
+        
+        try:
+            return True, [model['name'] for model in response.json().get('models', [])]
+        except Exception as e:
+            logger.error(f"Erro ao obter modelos disponíveis: {e}")
+            return True, []
+    
     def _get_models_via_cli(self) -> List[str]:
         """Tenta obter modelos via linha de comando"""
         try:
@@ -116,24 +159,33 @@ class OllamaService:
     
     def generate_response(self, model: str, prompt: str,
                         context_size: int = 4096,
-                        temperature: float = 0.7) -> Tuple[Optional[str], Optional[float]]:
+                        temperature: float = 0.7,
+                        on_token: Optional[Callable[[str], None]] = None,
+                        verificar_modelo: bool = True) -> Tuple[Optional[str], Optional[float]]:
         """
         Gera uma resposta usando o modelo especificado
 
+        Args:
+            on_token: Se informado, a resposta é recebida em streaming e cada
+                trecho é repassado a esta função assim que chega
+            verificar_modelo: False quando o chamador já escolheu o modelo a partir
+                de uma consulta recente a /api/tags (evita repetir a requisição)
+
         Returns:
             Tuple[Optional[str], Optional[float]]: (resposta, tempo_em_segundos)
         """
         try:
             # ✅ CORREÇÃO: Verificar se o modelo está disponível primeiro
-            available_models = self.get_available_models()
-            if model not in available_models:
-                logger.error(f"Modelo '{model}' não encontrado. Modelos disponíveis: {available_models}")
-                return None, None
+            if verificar_modelo:
+                available_models = self.get_available_models()
+                if model not in available_models:
+                    logger.error(f"Modelo '{model}' não encontrado. Modelos disponíveis: {available_models}")
+                    return None, None
 
             payload = {
                 "model": model,
                 "prompt": prompt,
-                "stream": False,
+                "stream": on_token is not None,
                 "options": {
                     "num_ctx": context_size,
                     "temperature": temperature
@@ -143,33 +195,34 @@ class OllamaService:
             # Marca o início da requisição
             start_time = time.time()
 
-            response = requests.post(
+            with requests.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
-                timeout=1200
-            )
-
-            # Marca o fim da requisição
-            end_time = time.time()
-            elapsed_time = end_time - start_time
+                timeout=1200,
+                stream=on_token is not None
+            ) as response:
+                if response.status_code == 200:
+                    if on_token is None:
+                        response_text = response.json().get('response', '')
+                    else:
+                        response_text = self._consumir_stream(response, on_token)
 
-            if response.status_code == 200:
-                data = response.json()
-                response_text = data.get('response', '')
+                    # Marca o fim da requisição
+                    elapsed_time = time.time() - start_time
 
-                # Log do tempo de processamento
-                logger.info(f"⏱️ Tempo de resposta do LLM '{model}': {elapsed_time:.2f} segundos")
+                    # Log do tempo de processamento
+                    logger.info(f"⏱️ Tempo de resposta do LLM '{model}': {elapsed_time:.2f} segundos")
 
-                return response_text, elapsed_time
-            else:
-                error_msg = f"Erro na geração: {response.status_code} - {response.text}"
-                logger.error(error_msg)
+                    return response_text, elapsed_time
+                else:
+                    error_msg = f"Erro na geração: {response.status_code} - {response.text}"
+                    logger.error(error_msg)
 
-                # 🔥 ARMAZENA ERRO PARA DETECÇÃO
-                self._last_error = error_msg
+                    # 🔥 ARMAZENA ERRO PARA DETECÇÃO
+                    self._last_error = error_msg
 
-                # Lança exceção específica para ser capturada pelo modelo
-                raise Exception(error_msg)
+                    # Lança exceção específica para ser capturada pelo modelo
+                    raise Exception(error_msg)
 
         except Exception as e:
             error_msg = str(e)
@@ -180,6 +233,24 @@ class OllamaService:
 
             return None, None
     
+    @staticmethod
+    def _consumir_stream(response, on_token: Callable[[str], None]) -> str:
+        """Lê a resposta em streaming (uma linha JSON por trecho) e retorna o texto completo"""
+        partes = []
+        for linha in response.iter_lines():
+            if not linha:
+                continue
+            data = json.loads(linha)
+            if 'error' in data:
+                raise Exception(data['error'])
+            trecho = data.get('response', '')
+            if trecho:
+                partes.append(trecho)
+                on_token(trecho)
+            if data.get('done'):
+                break
+        return "".join(partes)
+    
     def identificar_tipo_erro(self, error_str: str) -> str:
         """
         Identifica o tipo de erro baseado na mensagem de erro